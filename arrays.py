@@ -0,0 +1,77 @@
+import sys
+
+from tokens import TokenType
+
+# NumPy is optional and slow to import, so it is only loaded when a program builds
+# its first array. Until then no array can exist and is_array() stays False.
+np = None
+
+def load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError: # Scalar programs run without it
+            return None
+        np = numpy
+    return np
+
+def make_array(values, output=None):
+    """Packs evaluated element values into a NumPy array."""
+    if load_numpy() is None:
+        print("Error: Array values require NumPy (pip install numpy).", file=output)
+        sys.exit(1)
+    # Convert string numbers to float, as binary operations do for scalars
+    try:
+        return np.array([float(value) if isinstance(value, str) else value for value in values])
+    except ValueError: # Ragged, e.g. [[1, 2], [3]]
+        print("Error: Array elements must all have the same shape.", file=output)
+        sys.exit(1)
+
+def shape_error(left, right, output=None):
+    """Reports operands whose shapes do not broadcast, e.g. [1, 2] + [1, 2, 3]."""
+    print(f"Error: Array shapes {np.shape(left)} and {np.shape(right)} do not match.", file=output)
+    sys.exit(1)
+
+def is_array(value):
+    return np is not None and isinstance(value, np.ndarray)
+
+def is_integral(value):
+    """True for Python ints and for NumPy arrays with an integer dtype."""
+    return isinstance(value, int) or (is_array(value) and value.dtype.kind in "iu")
+
+def array_division(left, right):
+    """Divides when either operand is an array, with the scalar rules applied
+    element-wise: a zero divisor raises ZeroDivisionError, and integer operands
+    give an integer result."""
+    if np.any(right == 0): # NumPy would warn and produce inf or nan instead
+        raise ZeroDivisionError("division by zero")
+    result = left / right
+    if is_integral(left) and is_integral(right):
+        return result.astype(np.int64) # Truncates toward zero, like int()
+    return result
+
+def reduce_value(op, value, output=None):
+    """APL-style reduction (+/, -/, */) along the last axis of an array.
+
+    Reductions fold right to left as in APL, so -/ is an alternating sum. A scalar
+    reduces to itself, and a fully reduced array comes back as a Python number so
+    it keeps the scalar int/float rules afterwards. Errors are printed to `output`
+    (stdout by default) before exiting.
+    """
+    value = float(value) if isinstance(value, str) else value
+    if not is_array(value):
+        return value
+
+    if op == TokenType.PLUS:
+        result = np.add.reduce(value, axis=-1)
+    elif op == TokenType.MUL:
+        result = np.multiply.reduce(value, axis=-1)
+    elif op == TokenType.MINUS:
+        # a - (b - (c - d)) == (a + c) - (b + d)
+        result = value[..., 0::2].sum(axis=-1) - value[..., 1::2].sum(axis=-1)
+    else:
+        print(f"Error: Unknown reduction operator '{op}'.", file=output)
+        sys.exit(1)
+
+    return result.item() if np.ndim(result) == 0 else result
@@ -0,0 +1,109 @@
+from array import array
+
+from tokens import TOKEN_TYPES
+from ast_nodes import NumberNode, VarNode, BinOpNode, AssignNode, PrintNode, ArrayNode, ReduceNode
+
+# Node kinds stored in ASTArena.kinds
+NUMBER_NODE = 0
+VAR_NODE = 1
+BINOP_NODE = 2
+ASSIGN_NODE = 3
+PRINT_NODE = 4
+ARRAY_NODE = 5
+REDUCE_NODE = 6
+
+class ASTArena:
+    """Struct-of-arrays AST storage.
+
+    Every node is an integer handle indexing parallel `array` columns instead of a
+    Python object. How the columns are used depends on the node kind:
+
+        kind         left         right        value                     op
+        NUMBER_NODE  -            -            index into constants      -
+        VAR_NODE     -            -            index into names          -
+        BINOP_NODE   left handle  right handle -                         TokenType code
+        ASSIGN_NODE  expr handle  -            index into names          -
+        PRINT_NODE   expr handle  -            -                         -
+        ARRAY_NODE   -            -            index into element_lists  -
+        REDUCE_NODE  operand      -            -                         TokenType code
+
+    An arena has the same methods as ast_nodes.NodeBuilder, so it can be handed to
+    Parser, whose parse() then returns a list of statement handles.
+    """
+    def __init__(self):
+        self.kinds = array('B')
+        self.ops = array('B')
+        self.lefts = array('i')
+        self.rights = array('i')
+        self.values = array('i')
+
+        # Side tables for the values the value column refers to, each entry stored once
+        self.constants = []
+        self.names = []
+        self.element_lists = [] # Tuple of element handles for each ARRAY_NODE
+        self._constant_index = {}
+        self._name_index = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _add(self, kind, op, left, right, value):
+        self.kinds.append(kind)
+        self.ops.append(op)
+        self.lefts.append(left)
+        self.rights.append(right)
+        self.values.append(value)
+        return len(self.kinds) - 1
+
+    def _intern(self, table, index, item, key):
+        if key not in index:
+            index[key] = len(table)
+            table.append(item)
+        return index[key]
+
+    def number(self, value):
+        # Keyed by type as well, so 1 and 1.0 stay distinct constants
+        return self._add(NUMBER_NODE, 0, -1, -1,
+                         self._intern(self.constants, self._constant_index, value, (value.__class__, value)))
+
+    def var(self, name):
+        return self._add(VAR_NODE, 0, -1, -1, self._intern(self.names, self._name_index, name, name))
+
+    def binop(self, left, op, right):
+        return self._add(BINOP_NODE, op, left, right, -1)
+
+    def assign(self, var, expr):
+        return self._add(ASSIGN_NODE, 0, expr, -1, self._intern(self.names, self._name_index, var, var))
+
+    def print_(self, expr):
+        return self._add(PRINT_NODE, 0, expr, -1, -1)
+
+    def array(self, elements):
+        self.element_lists.append(tuple(elements))
+        return self._add(ARRAY_NODE, 0, -1, -1, len(self.element_lists) - 1)
+
+    def reduce(self, op, operand):
+        return self._add(REDUCE_NODE, op, operand, -1, -1)
+
+    def to_node(self, handle):
+        """Rebuilds the ast_nodes object tree for a handle, e.g. for printing."""
+        kind = self.kinds[handle]
+        if kind == NUMBER_NODE:
+            return NumberNode(self.constants[self.values[handle]])
+        if kind == VAR_NODE:
+            return VarNode(self.names[self.values[handle]])
+        if kind == BINOP_NODE:
+            return BinOpNode(self.to_node(self.lefts[handle]), TOKEN_TYPES[self.ops[handle]],
+                             self.to_node(self.rights[handle]))
+        if kind == ARRAY_NODE:
+            return ArrayNode([self.to_node(element) for element in self.element_lists[self.values[handle]]])
+        if kind == REDUCE_NODE:
+            return ReduceNode(TOKEN_TYPES[self.ops[handle]], self.to_node(self.lefts[handle]))
+        if kind == ASSIGN_NODE:
+            return AssignNode(self.names[self.values[handle]], self.to_node(self.lefts[handle]))
+        return PrintNode(self.to_node(self.lefts[handle]))
+
+    def nbytes(self):
+        """Bytes used by the node columns themselves, excluding the side tables."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kinds, self.ops, self.lefts, self.rights, self.values))
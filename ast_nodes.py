@@ -1,9 +1,11 @@
 class ASTNode:
     """Base class for all AST nodes."""
-    pass
+    __slots__ = ()
 
 class NumberNode(ASTNode):
     """Represents a numeric value."""
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
     
@@ -12,14 +14,19 @@ class NumberNode(ASTNode):
 
 class VarNode(ASTNode):
     """Represents a variable reference."""
+    __slots__ = ("name", "slot")
+
     def __init__(self, name):
         self.name = name
+        self.slot = None # Variable slot number, filled in by resolver.Resolver
     
     def __repr__(self):
         return f"VarNode({self.name})"
 
 class BinOpNode(ASTNode):
     """Represents a binary operation (e.g., addition, subtraction)."""
+    __slots__ = ("left", "op", "right")
+
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
@@ -30,17 +37,54 @@ class BinOpNode(ASTNode):
 
 class AssignNode(ASTNode):
     """Represents a variable assignment statement."""
+    __slots__ = ("var", "expr", "slot")
+
     def __init__(self, var, expr):
         self.var = var
         self.expr = expr
+        self.slot = None # Variable slot number, filled in by resolver.Resolver
 
     def __repr__(self):
         return f"AssignNode(var={self.var}, expr={self.expr})"
 
 class PrintNode(ASTNode):
     """Represents a print statement."""
+    __slots__ = ("expr",)
+
     def __init__(self, expr):
         self.expr = expr
 
     def __repr__(self):
         return f"PrintNode(expr={self.expr})"
+
+class ArrayNode(ASTNode):
+    """Represents an array literal such as [1, 2, 3]."""
+    __slots__ = ("elements",)
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def __repr__(self):
+        return f"ArrayNode(elements={self.elements})"
+
+class ReduceNode(ASTNode):
+    """Represents an APL-style reduction such as +/ x."""
+    __slots__ = ("op", "operand")
+
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+    def __repr__(self):
+        return f"ReduceNode(op={self.op}, operand={self.operand})"
+
+class NodeBuilder:
+    """Creates the node objects above. Parser builds through this interface, so an
+    ASTArena (see ast_arena.py) can be passed in its place."""
+    number = NumberNode
+    var = VarNode
+    binop = BinOpNode
+    assign = AssignNode
+    print_ = PrintNode
+    array = ArrayNode
+    reduce = ReduceNode
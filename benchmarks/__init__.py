@@ -0,0 +1,2 @@
+"""Benchmarks for the lexer, parser and interpreter. Run modules from the repository root,
+e.g. `python -m benchmarks.bench_lexer`."""
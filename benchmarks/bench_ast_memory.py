@@ -0,0 +1,94 @@
+import argparse
+import contextlib
+import gc
+import io
+import tracemalloc
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from ast_nodes import NodeBuilder
+from ast_arena import ASTArena
+from benchmarks.bench_vm import make_source
+
+class DictNumberNode:
+    def __init__(self, value):
+        self.value = value
+
+class DictVarNode:
+    def __init__(self, name):
+        self.name = name
+
+class DictBinOpNode:
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+
+class DictAssignNode:
+    def __init__(self, var, expr):
+        self.var = var
+        self.expr = expr
+
+class DictPrintNode:
+    def __init__(self, expr):
+        self.expr = expr
+
+class DictNodeBuilder:
+    """Builds nodes laid out like the original ast_nodes classes, with a __dict__ each."""
+    number = DictNumberNode
+    var = DictVarNode
+    binop = DictBinOpNode
+    assign = DictAssignNode
+    print_ = DictPrintNode
+
+class CountingBuilder:
+    """Wraps a builder and counts the nodes it creates."""
+    def __init__(self, builder):
+        self.inner = builder
+        self.count = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.inner, name)
+        def build(*args):
+            self.count += 1
+            return method(*args)
+        return build
+
+def measure(tokens, make_builder):
+    """Returns (bytes retained by the parsed AST, nodes built)."""
+    gc.collect()
+    tracemalloc.start()
+    builder = CountingBuilder(make_builder())
+    statements = Parser(tokens, builder).parse()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del statements
+    return retained, builder.count
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare AST memory use per node.")
+    parser.add_argument("--statements", type=int, default=20000, help="number of let statements")
+    args = parser.parse_args()
+
+    tokens = Lexer(make_source(args.statements)).tokenize_buffer()
+
+    for label, make_builder in (("dict nodes", DictNodeBuilder), ("slots nodes", NodeBuilder),
+                                ("arena", ASTArena)):
+        retained, count = measure(tokens, make_builder)
+        print(f"{label:12} {count} nodes  {retained / count:6.1f} bytes/node")
+
+    # The arena must run to the same output as the object tree
+    arena = ASTArena()
+    handles = Parser(tokens, arena).parse()
+    tree_output, arena_output = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(tree_output):
+        Interpreter().interpret(Parser(tokens).parse())
+    with contextlib.redirect_stdout(arena_output):
+        Interpreter().interpret_arena(arena, handles)
+    if tree_output.getvalue() != arena_output.getvalue():
+        raise SystemExit("Arena execution differs from the object tree")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from batch import run_scripts
+from benchmarks.generators import let_chain
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one process per script with the batch worker pool.")
+    parser.add_argument("--scripts", type=int, default=500, help="number of small scripts")
+    parser.add_argument("--statements", type=int, default=50, help="statements per script")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes for the pool")
+    parser.add_argument("--sample", type=int, default=50,
+                        help="scripts actually started as separate processes; the total is extrapolated")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = []
+        for index in range(args.scripts):
+            path = os.path.join(directory, f"script{index}.txt")
+            with open(path, "w") as source:
+                source.write(let_chain(args.statements, seed=index))
+            paths.append(path)
+
+        sample = paths[:args.sample]
+        start = time.perf_counter()
+        for path in sample:
+            subprocess.run([sys.executable, "main.py", path], stdout=subprocess.DEVNULL, check=True)
+        per_process = (time.perf_counter() - start) / len(sample)
+
+        start = time.perf_counter()
+        serial = list(run_scripts(paths, jobs=1))
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = list(run_scripts(paths, jobs=args.jobs))
+        pool_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory)
+
+    if [result.output for result in serial] != [result.output for result in pooled]:
+        raise SystemExit("pool output differs from the serial run")
+    failed = sum(result.status for result in pooled)
+
+    process_time = per_process * args.scripts
+    print(f"{args.scripts} scripts of {args.statements} statements, {failed} failed")
+    print(f"one process per script: {process_time:8.2f} s  (extrapolated from {len(sample)})")
+    print(f"in-process, serial:     {serial_time:8.2f} s  ({process_time / serial_time:.1f}x)")
+    print(f"pool of {args.jobs} workers:      {pool_time:8.2f} s  ({process_time / pool_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
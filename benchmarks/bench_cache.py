@@ -0,0 +1,61 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from cache import CompileCache
+from main import compile_program
+from benchmarks.bench_vm import make_source
+
+def best_of(run, repeat, setup=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold (parse) and warm (cache hit) program loading.")
+    parser.add_argument("--statements", type=int, default=20000, help="number of let statements")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per mode, best time is reported")
+    parser.add_argument("-O", "--optimize", action="store_true", help="cache the optimized program")
+    parser.add_argument("--resolve", action="store_true", help="cache the resolved program")
+    args = parser.parse_args()
+
+    code = make_source(args.statements)
+    directory = tempfile.mkdtemp()
+    try:
+        cache = CompileCache(directory)
+        cold = best_of(lambda: compile_program(code, args, cache), args.repeat, setup=cache.clear)
+        warm = best_of(lambda: compile_program(code, args, cache), args.repeat)
+
+        # Whole `python main.py FILE` runs, including interpreter startup and execution
+        path = os.path.join(directory, "program.txt")
+        with open(path, "w") as source:
+            source.write(code)
+        command = [sys.executable, "main.py", "--cache-dir", directory, path]
+        if args.optimize:
+            command.append("-O")
+        if args.resolve:
+            command.append("--resolve")
+        run = lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        cold_process = best_of(run, args.repeat, setup=cache.clear)
+        warm_process = best_of(run, args.repeat)
+        size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".astc"))
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"{args.statements} statements, {len(code)} bytes of source, {size} bytes cached")
+    print(f"load, cold (lex + parse + store): {cold * 1000:8.1f} ms")
+    print(f"load, warm (cache hit):           {warm * 1000:8.1f} ms  ({cold / warm:.1f}x)")
+    print(f"main.py, cold:                    {cold_process * 1000:8.1f} ms")
+    print(f"main.py, warm:                    {warm_process * 1000:8.1f} ms  ({cold_process / warm_process:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import io
+import random
+import time
+import warnings
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from codegen import CompiledProgram, NativeInterpreter
+from benchmarks.generators import WORKLOADS
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def outcome(engine, ast):
+    """Output and the way a run ended: None, 'exit' (a reported error) or an exception name."""
+    output = io.StringIO()
+    try:
+        engine(output).interpret(ast)
+        error = None
+    except SystemExit:
+        error = "exit"
+    except Exception as e:
+        error = type(e).__name__
+    return output.getvalue(), error
+
+def random_program(rng):
+    """A short program mixing ints, floats, arrays, reductions, undefined variables
+    and divisions that may hit zero."""
+    def expression(depth=0):
+        roll = rng.random()
+        if depth > 4 or roll < 0.3:
+            return rng.choice((str(rng.randint(0, 3)), f"{rng.randint(0, 3)}.5"))
+        if roll < 0.6:
+            return rng.choice("abcdq")
+        if roll < 0.64:
+            return rng.choice(("[1, 2.5]", "[3, 4]"))
+        if roll < 0.67:
+            return f"{rng.choice('+-*')}/ {expression(depth + 1)}"
+        return f"({expression(depth + 1)} {rng.choice('+-*/')} {expression(depth + 1)})"
+
+    lines = []
+    for _ in range(rng.randint(1, 8)):
+        if rng.random() < 0.7:
+            lines.append(f"let {rng.choice('abcd')} = {expression()};")
+        else:
+            lines.append(f"print({expression()});")
+    return "\n".join(lines)
+
+def check(programs, seed):
+    """Differential run: every program must give the same output and the same kind of
+    failure under the Interpreter and as compiled Python code."""
+    rng = random.Random(seed)
+    with warnings.catch_warnings(): # NumPy warns about division by zero in arrays
+        warnings.simplefilter("ignore")
+        for _ in range(programs):
+            source = random_program(rng)
+            ast = parse(source)
+            expected, actual = outcome(Interpreter, ast), outcome(NativeInterpreter, ast)
+            if expected != actual:
+                raise SystemExit(f"compiled code differs from the Interpreter on:\n{source}\n"
+                                 f"interpreter: {expected}\ncompiled:    {actual}")
+    print(f"{programs} random programs: compiled code matches the Interpreter")
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tree-walking with compiled Python code.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per engine, best time is reported")
+    parser.add_argument("--scale", type=float, default=0.5, help="multiplies the number of statements")
+    parser.add_argument("--check", type=int, default=2000, metavar="N",
+                        help="random programs for the differential check first (0 skips it)")
+    args = parser.parse_args()
+
+    if args.check:
+        check(args.check, seed=0)
+
+    for name, (generate, options) in WORKLOADS.items():
+        options = dict(options, statements=max(1, int(options["statements"] * args.scale)))
+        ast = parse(generate(**options))
+        program = CompiledProgram(ast)
+        if outcome(Interpreter, ast) != outcome(NativeInterpreter, ast):
+            raise SystemExit(f"{name}: compiled code differs from the Interpreter")
+
+        tree = best_time(lambda: Interpreter(io.StringIO()).interpret(ast), args.repeat)
+        compile_time = best_time(lambda: CompiledProgram(ast), args.repeat)
+        run = best_time(lambda: program.run(io.StringIO()), args.repeat)
+        print(f"{name:<12} tree {tree * 1000:8.1f} ms   compiled: run {run * 1000:8.1f} ms ({tree / run:4.1f}x), "
+              f"with compile {(run + compile_time) * 1000:8.1f} ms ({tree / (run + compile_time):4.1f}x)")
+
+if __name__ == "__main__":
+    main()
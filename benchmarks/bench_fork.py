@@ -0,0 +1,92 @@
+import argparse
+import copy
+import io
+import random
+import time
+import tracemalloc
+
+from lexer import Lexer
+from parser import Parser
+from ast_nodes import AssignNode
+from interpreter import Interpreter
+from benchmarks.generators import let_chain
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def variants(count, prefix_names, seed=0):
+    """Short scenario suffixes that rebind a prefix variable and read others."""
+    rng = random.Random(seed)
+    suffixes = []
+    for index in range(count):
+        a, b, c = rng.sample(prefix_names, 3)
+        suffixes.append(parse(f"let {a} = {index};\nlet result = {a} * {b} + {c};\nprint(result);"))
+    return suffixes
+
+def re_execute(prefix, suffixes):
+    results = []
+    for suffix in suffixes:
+        interpreter = Interpreter(io.StringIO())
+        interpreter.interpret(prefix)
+        interpreter.output = io.StringIO() # Compare only the output of the variant itself
+        interpreter.interpret(suffix)
+        results.append(interpreter)
+    return results
+
+def deep_copy(prefix, suffixes):
+    base = Interpreter(io.StringIO())
+    base.interpret(prefix)
+    results = []
+    for suffix in suffixes:
+        interpreter = Interpreter(io.StringIO())
+        interpreter.variables = copy.deepcopy(base.variables)
+        interpreter.interpret(suffix)
+        results.append(interpreter)
+    return results
+
+def fork(prefix, suffixes):
+    base = Interpreter(io.StringIO())
+    base.interpret(prefix)
+    snapshot = base.snapshot()
+    results = []
+    for suffix in suffixes:
+        interpreter = Interpreter.from_snapshot(snapshot, io.StringIO())
+        interpreter.interpret(suffix)
+        results.append(interpreter)
+    return results
+
+def measure(strategy, prefix, suffixes):
+    """Seconds to run every variant, and the memory still held with all of them alive."""
+    start = time.perf_counter()
+    results = strategy(prefix, suffixes)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    kept = strategy(prefix, suffixes)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, retained, [(item.output.getvalue(), item.variables.copy()) for item in results]
+
+def main():
+    parser = argparse.ArgumentParser(description="Branch many scenario variants off a shared prefix.")
+    parser.add_argument("--prefix", type=int, default=2000, help="statements in the shared prefix")
+    parser.add_argument("--variants", type=int, default=1000, help="scenario variants")
+    args = parser.parse_args()
+
+    prefix = parse(let_chain(args.prefix))
+    names = sorted({node.var for node in prefix if isinstance(node, AssignNode)})
+    suffixes = variants(args.variants, names)
+
+    print(f"prefix of {len(prefix)} statements ({len(names)} variables), {args.variants} variants")
+    expected = None
+    for name, strategy in (("re-execute", re_execute), ("deepcopy", deep_copy), ("fork", fork)):
+        elapsed, retained, results = measure(strategy, prefix, suffixes)
+        if expected is None:
+            expected = results
+        elif results != expected:
+            raise SystemExit(f"{name}: variants differ from re-execution")
+        print(f"{name:<10}  {elapsed * 1000:9.1f} ms   {retained / 1e6:8.2f} MB held by the variants")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import os
+import time
+
+from lexer import Lexer
+from benchmarks.generators import print_heavy
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of chunked parallel lexing with the number of workers.")
+    parser.add_argument("--statements", type=int, default=200000, help="statements in the generated source")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="characters per chunk")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help="worker counts to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration, best time is reported")
+    args = parser.parse_args()
+
+    source = print_heavy(args.statements)
+    serial, expected = best_time(lambda: Lexer(source).tokenize_buffer(), args.repeat)
+    print(f"{len(source) / 1e6:.1f} MB, {len(expected)} tokens, {os.cpu_count()} CPUs, "
+          f"chunks of {args.chunk_size} characters")
+    print(f"serial       {serial * 1000:8.1f} ms")
+
+    for workers in args.workers:
+        parallel, tokens = best_time(lambda: Lexer(source).tokenize_parallel(workers, args.chunk_size), args.repeat)
+        if (tokens.kinds, tokens.values, tokens.line_ends) != (expected.kinds, expected.values, expected.line_ends):
+            raise SystemExit(f"{workers} workers: tokens differ from the serial lexer")
+        print(f"{workers:>2} workers   {parallel * 1000:8.1f} ms  ({serial / parallel:.2f}x)")
+
+if __name__ == "__main__":
+    main()
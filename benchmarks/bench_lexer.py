@@ -0,0 +1,62 @@
+import argparse
+import time
+
+from lexer import Lexer
+from benchmarks.legacy_lexer import Lexer as LegacyLexer
+
+# A mix of the statements the interpreter understands plus comments and strings,
+# so every branch of the scanner is exercised.
+SAMPLE_LINES = [
+    "let a = 100 / 5;",
+    "let b = a - 3, c = (a + b) * 2;",
+    "print(b);",
+    "# a comment line with some words in it",
+    "let long_variable_name = long_variable_name_2 * 3.25 + 17;",
+    "print(\"a string literal\");",
+    "let d = (((a + b) * (c - 4)) / 2) - 1.5;",
+]
+
+def make_source(lines):
+    """Builds a program of the given number of lines by cycling through SAMPLE_LINES."""
+    return "\n".join(SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(lines))
+
+def same_stream(left, right):
+    """Checks two tokenize() results for identical token types and values."""
+    if len(left) != len(right):
+        return False
+    for left_line, right_line in zip(left, right):
+        if [(t.type, t.value) for t in left_line] != [(t.type, t.value) for t in right_line]:
+            return False
+    return True
+
+def measure(lex, source, repeat):
+    """Returns the best time of `repeat` runs and the tokens produced by the last run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = lex(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare lexer throughput against the legacy scanner.")
+    parser.add_argument("--lines", type=int, default=20000, help="number of source lines to lex")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per lexer, best time is reported")
+    args = parser.parse_args()
+
+    source = make_source(args.lines)
+    legacy_time, legacy_tokens = measure(lambda text: LegacyLexer(text).tokenize(), source, args.repeat)
+    new_time, new_tokens = measure(lambda text: Lexer(text).tokenize(), source, args.repeat)
+    buffer_time, _ = measure(lambda text: Lexer(text).tokenize_buffer(), source, args.repeat)
+
+    if not same_stream(legacy_tokens, new_tokens):
+        raise SystemExit("Token streams differ between the legacy and table-driven lexers")
+
+    count = sum(len(line) for line in new_tokens)
+    print(f"{count} tokens over {args.lines} lines")
+    print(f"legacy lexer: {count / legacy_time:12,.0f} tokens/s")
+    print(f"table lexer:  {count / new_time:12,.0f} tokens/s  ({legacy_time / new_time:.1f}x)")
+    print(f"token buffer: {count / buffer_time:12,.0f} tokens/s  ({legacy_time / buffer_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
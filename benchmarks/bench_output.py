@@ -0,0 +1,80 @@
+import argparse
+import contextlib
+import os
+import threading
+import time
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from output import BufferedOutput
+from main import print_tokens, print_ast
+
+def make_source(statements):
+    """Builds a print-heavy program: every assignment is followed by a print."""
+    lines = ["let a = 1;"]
+    for index in range(statements):
+        lines.append(f"let a = a + {index % 7};")
+        lines.append("print(a * 2);")
+    return "\n".join(lines)
+
+def measure(run, repeat):
+    """Best time of `repeat` calls of run(stream), where stream writes to a pipe that
+    another thread drains. Line buffering, as on a terminal, so every unbuffered print
+    is its own write to the OS."""
+    read_end, write_end = os.pipe()
+
+    def consume():
+        while os.read(read_end, 1 << 16):
+            pass
+
+    drain = threading.Thread(target=consume)
+    drain.start()
+    best = float("inf")
+    with open(write_end, "w", buffering=1) as stream:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(stream)
+            best = min(best, time.perf_counter() - start)
+    drain.join()
+    os.close(read_end)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare interactive dumps, direct prints and buffered output.")
+    parser.add_argument("--statements", type=int, default=50000, help="number of print statements")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per mode, best time is reported")
+    args = parser.parse_args()
+
+    code = make_source(args.statements)
+    start = time.perf_counter()
+    tokens = Lexer(code).tokenize_buffer()
+    ast = Parser(tokens).parse()
+    parse_time = time.perf_counter() - start
+
+    # What `python main.py` does after parsing: dump tokens and AST, then print every value directly
+    def interactive(stream):
+        with contextlib.redirect_stdout(stream):
+            print_tokens(tokens)
+            print_ast(ast)
+            Interpreter().interpret(ast)
+
+    # What `python main.py FILE` does after parsing, without and with the buffered writer
+    def direct(stream):
+        Interpreter(stream).interpret(ast)
+
+    def buffered(stream):
+        with BufferedOutput(stream) as output:
+            Interpreter(output).interpret(ast)
+
+    dumps_time = measure(interactive, args.repeat)
+    direct_time = measure(direct, args.repeat)
+    buffered_time = measure(buffered, args.repeat)
+
+    print(f"{args.statements} prints, lex + parse {parse_time * 1000:.1f} ms (same in every mode)")
+    print(f"interactive (dumps):  {dumps_time * 1000:8.1f} ms")
+    print(f"batch, direct print:  {direct_time * 1000:8.1f} ms  ({dumps_time / direct_time:.1f}x)")
+    print(f"batch, buffered:      {buffered_time * 1000:8.1f} ms  ({dumps_time / buffered_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import gc
+import io
+import time
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, QuickeningInterpreter
+from benchmarks.generators import WORKLOADS
+
+def run_times(engine, ast, runs):
+    """Times `runs` executions of the same parsed program; returns the times and the
+    output of the last run."""
+    times = []
+    for _ in range(runs):
+        output = io.StringIO()
+        gc.collect()
+        gc.disable() # Collections triggered by earlier runs would otherwise land in random runs
+        try:
+            start = time.perf_counter()
+            engine(output).interpret(ast)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return times, output.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the generic tree walker with per-site specialization "
+                                                 "when the same program runs repeatedly.")
+    parser.add_argument("--runs", type=int, default=20, help="executions of each program per engine")
+    parser.add_argument("--scale", type=float, default=0.5, help="multiplies the number of statements")
+    args = parser.parse_args()
+
+    for name, (generate, options) in WORKLOADS.items():
+        options = dict(options, statements=max(1, int(options["statements"] * args.scale)))
+        source = generate(**options)
+        ast = Parser(Lexer(source).tokenize_buffer()).parse()
+        table = {} # Shared by every run, as a host running the program repeatedly would
+
+        plain, plain_output = run_times(Interpreter, ast, args.runs)
+        quick, quick_output = run_times(lambda output: QuickeningInterpreter(output, table), ast, args.runs)
+        if plain_output != quick_output:
+            raise SystemExit(f"{name}: specialized output differs from the Interpreter")
+
+        sites = QuickeningInterpreter(sites=table).site_stats(ast)
+        hits = sum(site["hits"] for site in sites)
+        executions = len(sites) * args.runs
+        specialized = sum(site["specialized"] is not None for site in sites)
+        steady_plain, steady_quick = min(plain[-3:]), min(quick[-3:])
+        print(f"{name:<12} first run {plain[0] * 1000:7.1f} -> {quick[0] * 1000:7.1f} ms   "
+              f"steady {steady_plain * 1000:7.1f} -> {steady_quick * 1000:7.1f} ms ({steady_plain / steady_quick:.2f}x)   "
+              f"{specialized}/{len(sites)} sites specialized, {hits / executions:.0%} of executions hit")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import io
+import random
+import time
+import warnings
+
+from lexer import Lexer
+from parser import Parser
+from ast_nodes import PrintNode
+from interpreter import Interpreter
+from reactive import ReactiveInterpreter
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def random_program(rng, statements):
+    """Assignments that read a few earlier variables, reassignments included, and prints."""
+    names = []
+    lines = []
+    for _ in range(statements):
+        terms = rng.sample(names, min(len(names), rng.randint(0, 3))) + [str(rng.randint(1, 9))]
+        expression = f" {rng.choice('+-*')} ".join(terms)
+        if rng.random() < 0.2 and names:
+            lines.append(f"print({expression});")
+        else:
+            name = rng.choice(names) if names and rng.random() < 0.2 else f"v{len(names)}"
+            if name not in names:
+                names.append(name)
+            lines.append(f"let {name} = {expression};")
+    return lines
+
+def rendered(values):
+    return [str(value) for value in values]
+
+def check(programs, seed):
+    """Redefines a random binding of random programs and compares every cached value,
+    the variables and the reprinted values with a full run of the edited program."""
+    rng = random.Random(seed)
+    for _ in range(programs):
+        lines = random_program(rng, rng.randint(2, 30))
+        assignments = [index for index, line in enumerate(lines) if line.startswith("let")]
+        target = rng.choice(assignments)
+        name = lines[target].split()[1]
+        last = max(index for index in assignments if lines[index].split()[1] == name)
+        edit = f"let {name} = {rng.randint(1, 9)} * {rng.randint(1, 9)};"
+
+        reactive = ReactiveInterpreter(io.StringIO())
+        reactive.interpret(parse("\n".join(lines)))
+        before = rendered(reactive.values)
+        output = io.StringIO()
+        reactive.output = output
+        reactive.redefine(parse(edit)[0])
+
+        edited = lines[:last] + [edit] + lines[last + 1:]
+        fresh = ReactiveInterpreter(io.StringIO())
+        fresh.interpret(parse("\n".join(edited)))
+        after = rendered(fresh.values)
+        if rendered(reactive.values) != after or reactive.variables != fresh.variables:
+            raise SystemExit("redefinition differs from a full run of:\n" + "\n".join(edited))
+
+        # Every print whose value changed must have printed again, in program order
+        changed = [after[index] for index, node in enumerate(fresh.program)
+                   if isinstance(node, PrintNode) and after[index] != before[index]]
+        printed = iter(output.getvalue().splitlines())
+        if not all(value in printed for value in changed):
+            raise SystemExit("a changed print was not printed again:\n" + "\n".join(edited))
+    print(f"{programs} random redefinitions match a full run")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare re-running a whole program with redefining one input.")
+    parser.add_argument("--inputs", type=int, default=100, help="independent input variables")
+    parser.add_argument("--chains", type=int, default=20000, help="statements computed from the inputs")
+    parser.add_argument("--check", type=int, default=500, metavar="N",
+                        help="random redefinitions for the differential check first (0 skips it)")
+    args = parser.parse_args()
+
+    if args.check:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            check(args.check, seed=0)
+
+    # Every computed value reads one input and the previous value computed from it
+    rng = random.Random(1)
+    lines = [f"let in{index} = {index};" for index in range(args.inputs)]
+    for index in range(args.chains):
+        source = index % args.inputs
+        previous = f"c{index - args.inputs}" if index >= args.inputs else f"in{source}"
+        lines.append(f"let c{index} = {previous} + in{source} * {rng.randint(1, 9)};")
+    program = parse("\n".join(lines))
+
+    reactive = ReactiveInterpreter(io.StringIO())
+    reactive.interpret(program)
+    edit = parse("let in0 = 1000;")[0]
+    start = time.perf_counter()
+    recomputed = reactive.redefine(edit)
+    update = time.perf_counter() - start
+
+    edited = [edit] + program[1:]
+    start = time.perf_counter()
+    interpreter = Interpreter(io.StringIO())
+    interpreter.interpret(edited)
+    rerun = time.perf_counter() - start
+    if interpreter.variables != reactive.variables:
+        raise SystemExit("redefinition differs from re-running the program")
+
+    print(f"{len(program)} statements, redefining in0: full re-run {rerun * 1000:.2f} ms, "
+          f"redefine {update * 1000:.2f} ms ({rerun / update:.0f}x), "
+          f"{recomputed} re-evaluated, {reactive.skipped} skipped")
+
+if __name__ == "__main__":
+    main()
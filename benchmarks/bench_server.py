@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from batch import run_source
+from server import request
+from benchmarks.generators import let_chain
+
+async def wait_for_server(address, process):
+    for _ in range(200):
+        if process.poll() is not None:
+            raise SystemExit("server exited during startup")
+        try:
+            await request(address, "")
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise SystemExit("server did not start")
+
+async def measure(address, programs, clients):
+    """Time to evaluate all programs one after another, then with `clients` requests in flight."""
+    start = time.perf_counter()
+    for source in programs:
+        output, _ = await request(address, source)
+    sequential = time.perf_counter() - start
+
+    queue = list(programs)
+    results = {}
+    async def client():
+        while queue:
+            source = queue.pop()
+            results[source] = await request(address, source)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    concurrent = time.perf_counter() - start
+    return sequential, concurrent, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one main.py process per evaluation with a running server.")
+    parser.add_argument("--requests", type=int, default=200, help="number of small programs")
+    parser.add_argument("--statements", type=int, default=20, help="statements per program")
+    parser.add_argument("--clients", type=int, default=8, help="requests in flight in the concurrent run")
+    parser.add_argument("--sample", type=int, default=30,
+                        help="programs actually started as separate processes; the total is extrapolated")
+    args = parser.parse_args()
+
+    programs = [let_chain(args.statements, seed=index) for index in range(args.requests)]
+
+    start = time.perf_counter()
+    for source in programs[:args.sample]:
+        subprocess.run([sys.executable, "main.py", "-"], input=source, text=True,
+                       stdout=subprocess.DEVNULL, check=True)
+    per_process = (time.perf_counter() - start) / args.sample
+
+    address = os.path.join(tempfile.mkdtemp(), "server.sock")
+    server = subprocess.Popen([sys.executable, "main.py", "--serve", address], stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_for_server(address, server))
+        sequential, concurrent, results = asyncio.run(measure(address, programs, args.clients))
+    finally:
+        server.terminate()
+        server.wait()
+        os.rmdir(os.path.dirname(address))
+
+    for source in programs:
+        expected = run_source(source)
+        if results[source] != (expected.output, expected.error):
+            raise SystemExit("server output differs from an in-process run")
+
+    process_time = per_process * args.requests
+    print(f"{args.requests} programs of {args.statements} statements")
+    print(f"one process per program: {process_time * 1000:8.1f} ms  (extrapolated from {args.sample})")
+    print(f"server, one at a time:   {sequential * 1000:8.1f} ms  ({process_time / sequential:.1f}x)")
+    print(f"server, {args.clients} in flight:     {concurrent * 1000:8.1f} ms  ({process_time / concurrent:.1f}x)")
+
+if __name__ == "__main__":
+    main()
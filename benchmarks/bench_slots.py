@@ -0,0 +1,56 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, SlotInterpreter
+from resolver import Resolver
+
+def make_source(statements, variables, seed=0):
+    """Builds a program where every statement reads several of `variables` live variables."""
+    rng = random.Random(seed)
+    lines = [f"let v{index} = {index};" for index in range(variables)]
+    for index in range(statements):
+        a, b, c, d = (rng.randrange(variables) for _ in range(4))
+        lines.append(f"let v{rng.randrange(variables)} = v{a} + v{b} * 2 - v{c} + v{d};")
+    lines.append(f"print(v0);")
+    return "\n".join(lines)
+
+def measure(run, repeat):
+    """Returns the best wall time of `repeat` calls and the output of the last call."""
+    best = float("inf")
+    for _ in range(repeat):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    return best, output.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict-based variables with resolved slots.")
+    parser.add_argument("--statements", type=int, default=50000, help="number of assignments")
+    parser.add_argument("--variables", type=int, default=200, help="number of distinct variables")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per engine, best time is reported")
+    args = parser.parse_args()
+
+    ast = Parser(Lexer(make_source(args.statements, args.variables)).tokenize_buffer()).parse()
+    resolve_time, _ = measure(lambda: Resolver().resolve(ast), args.repeat)
+    names = Resolver().resolve(ast)
+
+    dict_time, dict_output = measure(lambda: Interpreter().interpret(ast), args.repeat)
+    slot_time, slot_output = measure(lambda: SlotInterpreter(names).interpret(ast), args.repeat)
+
+    if dict_output != slot_output:
+        raise SystemExit("Slot execution differs from the dict-based Interpreter")
+
+    print(f"{len(ast)} statements, {len(names)} slots")
+    print(f"dict variables:  {dict_time * 1000:8.1f} ms")
+    print(f"slot variables:  {slot_time * 1000:8.1f} ms  ({dict_time / slot_time:.2f}x)")
+    print(f"resolve pass:    {resolve_time * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
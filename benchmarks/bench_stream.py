@@ -0,0 +1,74 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from stream import parse_stream
+from benchmarks.generators import print_heavy
+
+class Sink:
+    """Output stream that keeps only the time of the first write and a digest of the text."""
+    def __init__(self):
+        self.first = None
+        self.size = 0
+        self.tail = ""
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+        self.size += len(text)
+        self.tail = text or self.tail
+        return len(text)
+
+def run_whole(path, output):
+    with open(path) as source:
+        code = source.read()
+    Interpreter(output).interpret(Parser(Lexer(code).tokenize_buffer()).parse())
+
+def run_streamed(path, output):
+    with open(path) as source:
+        Interpreter(output).interpret(parse_stream(source))
+
+def measure(run, path):
+    """(seconds to first output, total seconds, peak traced bytes); the peak comes from
+    a second run under tracemalloc, which slows everything down."""
+    output = Sink()
+    start = time.perf_counter()
+    run(path, output)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    run(path, Sink())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output.first - start, total, peak, (output.size, output.tail)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parsing whole files before running with "
+                                                 "running statements as they are parsed.")
+    parser.add_argument("--statements", type=int, default=100000, help="statements in the generated program")
+    args = parser.parse_args()
+
+    descriptor, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(descriptor, "w") as source:
+            source.write(print_heavy(args.statements))
+        size = os.path.getsize(path)
+        whole = measure(run_whole, path)
+        streamed = measure(run_streamed, path)
+    finally:
+        os.unlink(path)
+
+    if whole[3] != streamed[3]:
+        raise SystemExit("streamed output differs from the whole-file run")
+    print(f"{args.statements} statements, {size / 1e6:.1f} MB of source")
+    for name, (first, total, peak, _) in (("whole file", whole), ("streamed", streamed)):
+        print(f"{name:<10}  first output {first * 1000:8.2f} ms   total {total * 1000:8.1f} ms   "
+              f"peak memory {peak / 1e6:7.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from vm import VM, Compiler
+
+def make_source(statements, seed=0):
+    """Builds a random straight-line program of `let` chains with an occasional print."""
+    rng = random.Random(seed)
+    lines = ["let v0 = 1;"]
+    for index in range(1, statements):
+        a, b = rng.randrange(index), rng.randrange(index)
+        op = rng.choice("+-*")
+        lines.append(f"let v{index} = (v{a} {op} {rng.randint(1, 9)}) / 3 + v{b} * 0.5;")
+        if index % 10 == 0:
+            lines.append(f"print(v{index});")
+    return "\n".join(lines)
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def measure(run, repeat):
+    """Returns the best wall time of `repeat` calls and the output of the last call."""
+    best = float("inf")
+    for _ in range(repeat):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    return best, output.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the tree-walking Interpreter with the bytecode VM.")
+    parser.add_argument("--statements", type=int, default=20000, help="number of let statements")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per engine, best time is reported")
+    args = parser.parse_args()
+
+    ast = parse(make_source(args.statements))
+    code = Compiler().compile(ast)
+
+    tree_time, tree_output = measure(lambda: Interpreter().interpret(ast), args.repeat)
+    vm_time, vm_output = measure(lambda: VM().run(code), args.repeat)
+    compile_time, _ = measure(lambda: Compiler().compile(ast), args.repeat)
+
+    if tree_output != vm_output:
+        raise SystemExit("VM output differs from the tree-walking Interpreter")
+
+    instructions = len(code.code) // 2
+    print(f"{len(ast)} statements, {instructions} instructions")
+    print(f"tree walker:     {tree_time * 1000:8.1f} ms")
+    print(f"vm (run only):   {vm_time * 1000:8.1f} ms  ({tree_time / vm_time:.1f}x)")
+    print(f"vm (+ compile):  {(vm_time + compile_time) * 1000:8.1f} ms  ({tree_time / (vm_time + compile_time):.1f}x)")
+
+if __name__ == "__main__":
+    main()
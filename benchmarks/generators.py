@@ -0,0 +1,69 @@
+"""Seeded generators of large synthetic programs. The same arguments always give the
+same source text, so timings from different runs are comparable."""
+import random
+
+def let_chain(statements, seed=0):
+    """Straight-line `let` statements, each reading two earlier variables. Values stay
+    small: the second variable is always scaled down."""
+    rng = random.Random(seed)
+    lines = ["let v0 = 1;"]
+    for index in range(1, statements):
+        a, b = rng.randrange(index), rng.randrange(index)
+        scale = rng.randint(1, 9)
+        lines.append(f"let v{index} = v{a} {rng.choice('+-')} v{b} * {scale} / {scale + rng.randint(1, 9)};")
+    lines.append(f"print(v{statements - 1});")
+    return "\n".join(lines)
+
+def nested_expressions(statements, depth=50, seed=0):
+    """Statements whose right-hand side is `depth` levels of nested parentheses.
+
+    The recursive-descent Parser and the Interpreter recurse once per level, so
+    keep `depth` well below the recursion limit.
+    """
+    rng = random.Random(seed)
+    lines = ["let x = 2;"]
+    for _ in range(statements):
+        expression = str(rng.randint(1, 9))
+        for _ in range(depth):
+            operand = rng.choice(("x", str(rng.randint(1, 9))))
+            if rng.random() < 0.5:
+                expression = f"({expression} {rng.choice('+-*')} {operand})"
+            else:
+                expression = f"({operand} {rng.choice('+-*')} {expression})"
+        lines.append(f"let y = {expression} / {rng.randint(2, 9)};")
+    lines.append("print(y);")
+    return "\n".join(lines)
+
+def wide_expressions(statements, terms=200, seed=0):
+    """Statements with one long flat expression of `terms` operands.
+
+    Left-associative chains are as deep as they are wide once parsed, so the same
+    recursion caveat as nested_expressions applies.
+    """
+    rng = random.Random(seed)
+    lines = ["let a = 3;", "let b = 7;"]
+    for index in range(statements):
+        parts = [str(rng.randint(1, 99))]
+        for _ in range(terms - 1):
+            parts.append(rng.choice("+-*"))
+            parts.append(rng.choice(("a", "b", str(rng.randint(1, 99)))))
+        lines.append(f"let w{index % 10} = {' '.join(parts)};")
+    lines.append("print(w0);")
+    return "\n".join(lines)
+
+def print_heavy(statements, seed=0):
+    """Alternating assignments and prints, dominated by output."""
+    rng = random.Random(seed)
+    lines = ["let a = 1;"]
+    for _ in range(statements):
+        lines.append(f"let a = a + {rng.randint(0, 9)};")
+        lines.append(f"print(a * {rng.randint(1, 9)});")
+    return "\n".join(lines)
+
+# Workload name -> (generator, keyword arguments) used by benchmarks.run
+WORKLOADS = {
+    "let_chain": (let_chain, {"statements": 20000}),
+    "nested": (nested_expressions, {"statements": 2000, "depth": 50}),
+    "wide": (wide_expressions, {"statements": 500, "terms": 200}),
+    "print_heavy": (print_heavy, {"statements": 20000}),
+}
@@ -0,0 +1,153 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from ast_nodes import *
+from benchmarks.generators import WORKLOADS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Phase -> the result key holding its throughput
+RATES = {"lex": "tokens_per_s", "parse": "nodes_per_s", "run": "statements_per_s"}
+
+def count_nodes(nodes):
+    """Counts the AST nodes reachable from a statement list."""
+    count = 0
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+            continue
+        count += 1
+        if isinstance(node, BinOpNode):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, (AssignNode, PrintNode)):
+            pending.append(node.expr)
+        elif isinstance(node, ArrayNode):
+            pending.extend(node.elements)
+        elif isinstance(node, ReduceNode):
+            pending.append(node.operand)
+    return count
+
+def best_time(run, repeat):
+    # The garbage collector is paused while timing, as timeit does, so collections
+    # triggered by earlier allocations do not land in a random phase
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def peak_memory(run):
+    """Peak bytes allocated while run() executes, above what was live before it."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        run()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+def measure_workload(source, repeat):
+    tokens = Lexer(source).tokenize_buffer()
+    ast = Parser(tokens).parse()
+    statements = len(ast)
+
+    with open(os.devnull, "w") as sink:
+        phases = {
+            "lex": lambda: Lexer(source).tokenize_buffer(),
+            "parse": lambda: Parser(tokens).parse(),
+            "run": lambda: Interpreter(sink).interpret(ast),
+        }
+        sizes = {"lex": len(tokens), "parse": count_nodes(ast), "run": statements}
+        results = {}
+        for phase, run in phases.items():
+            seconds = best_time(run, repeat)
+            results[phase] = {
+                "seconds": seconds,
+                RATES[phase]: sizes[phase] / seconds,
+                "peak_bytes": peak_memory(run), # Separate run: tracing slows the timed ones down
+            }
+    return results
+
+def compare(results, baseline, threshold):
+    """Returns one message per phase that is slower, or uses more memory, than the
+    baseline by more than `threshold` (a fraction)."""
+    regressions = []
+    for workload, phases in results.items():
+        for phase, result in phases.items():
+            expected = baseline.get(workload, {}).get(phase)
+            if expected is None:
+                continue
+            rate = RATES[phase]
+            if result[rate] < expected[rate] * (1 - threshold):
+                regressions.append(f"{workload}/{phase}: {rate} {result[rate]:,.0f} "
+                                   f"< baseline {expected[rate]:,.0f}")
+            if result["peak_bytes"] > expected["peak_bytes"] * (1 + threshold):
+                regressions.append(f"{workload}/{phase}: peak_bytes {result['peak_bytes']:,} "
+                                   f"> baseline {expected['peak_bytes']:,}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and peak memory of each phase on synthetic programs.")
+    parser.add_argument("workloads", nargs="*", help=f"workloads to run (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per phase, best time is reported")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the number of statements")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against, if it exists (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown or memory growth before a phase counts as a regression")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON instead of a table")
+    args = parser.parse_args()
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload '{name}'")
+
+    results = {}
+    for name in args.workloads or WORKLOADS:
+        generate, options = WORKLOADS[name]
+        options = dict(options, statements=max(1, int(options["statements"] * args.scale)))
+        results[name] = measure_workload(generate(seed=args.seed, **options), args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, phases in results.items():
+            for phase, result in phases.items():
+                rate = RATES[phase]
+                print(f"{name:<12} {phase:<6} {result['seconds'] * 1000:9.1f} ms  "
+                      f"{result[rate]:14,.0f} {rate:<17} {result['peak_bytes'] / 1e6:8.1f} MB peak")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+            baseline_file.write("\n")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import hashlib
+import marshal
+import os
+import sys
+from array import array
+
+from tokens import TOKEN_TYPES
+from ast_nodes import *
+
+# Modules whose code decides what a cached program looks like. Their contents are part
+# of every cache key, so editing any of them invalidates old entries automatically.
+COMPILER_MODULES = ("tokens", "lexer", "parser", "ast_nodes", "optimizer", "resolver", "cache")
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                 "apl_interpreter")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Record kinds of the postfix encoding
+NUMBER_RECORD = 0   # arg: the value
+VAR_RECORD = 1      # arg: (name, slot)
+BINOP_RECORD = 2    # arg: TokenType code; pops right, then left
+ASSIGN_RECORD = 3   # arg: (var, slot); pops expr
+PRINT_RECORD = 4    # pops expr
+ARRAY_RECORD = 5    # arg: element count; pops that many elements
+REDUCE_RECORD = 6   # arg: TokenType code; pops operand
+LIST_RECORD = 7     # arg: item count; pops that many statements or nested lists
+
+_interpreter_version = None
+
+def interpreter_version():
+    """Hash of the compiler modules' source, computed once per process."""
+    global _interpreter_version
+    if _interpreter_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in COMPILER_MODULES:
+            with open(os.path.join(directory, name + ".py"), "rb") as module_file:
+                digest.update(module_file.read())
+        _interpreter_version = digest.hexdigest()
+    return _interpreter_version
+
+def encode(nodes):
+    """Flattens a statement list into postfix (kinds, args) records.
+
+    A flat encoding keeps deeply nested expressions within marshal's nesting limit
+    and is rebuilt by decode() without recursion. Raises TypeError for anything
+    that is not an AST node or list.
+    """
+    kinds = array('B')
+    args = []
+    pending = [nodes]
+    push = pending.append
+    while pending:
+        node = pending.pop()
+
+        if isinstance(node, tuple): # A parent record whose children have all been written
+            kinds.append(node[0])
+            args.append(node[1])
+        elif isinstance(node, NumberNode):
+            kinds.append(NUMBER_RECORD)
+            args.append(node.value)
+        elif isinstance(node, VarNode):
+            kinds.append(VAR_RECORD)
+            args.append((node.name, node.slot))
+        elif isinstance(node, BinOpNode):
+            push((BINOP_RECORD, int(node.op)))
+            push(node.right)
+            push(node.left)
+        elif isinstance(node, AssignNode):
+            push((ASSIGN_RECORD, (node.var, node.slot)))
+            push(node.expr)
+        elif isinstance(node, PrintNode):
+            push((PRINT_RECORD, None))
+            push(node.expr)
+        elif isinstance(node, ArrayNode):
+            push((ARRAY_RECORD, len(node.elements)))
+            pending.extend(reversed(node.elements))
+        elif isinstance(node, ReduceNode):
+            push((REDUCE_RECORD, int(node.op)))
+            push(node.operand)
+        elif isinstance(node, list):
+            push((LIST_RECORD, len(node)))
+            pending.extend(reversed(node))
+        else:
+            raise TypeError(f"Cannot encode node type '{type(node)}'.")
+    return kinds.tobytes(), args
+
+def decode(kinds, args):
+    """Rebuilds the statement list written by encode()."""
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for kind, arg in zip(kinds, args):
+        if kind == NUMBER_RECORD:
+            push(NumberNode(arg))
+        elif kind == VAR_RECORD:
+            node = VarNode(arg[0])
+            node.slot = arg[1]
+            push(node)
+        elif kind == BINOP_RECORD:
+            right = pop()
+            push(BinOpNode(pop(), TOKEN_TYPES[arg], right))
+        elif kind == ASSIGN_RECORD:
+            node = AssignNode(arg[0], pop())
+            node.slot = arg[1]
+            push(node)
+        elif kind == PRINT_RECORD:
+            push(PrintNode(pop()))
+        elif kind == REDUCE_RECORD:
+            push(ReduceNode(TOKEN_TYPES[arg], pop()))
+        else: # ARRAY_RECORD and LIST_RECORD
+            items = stack[len(stack) - arg:]
+            del stack[len(stack) - arg:]
+            push(ArrayNode(items) if kind == ARRAY_RECORD else items)
+    return stack.pop()
+
+class CompileCache:
+    """On-disk cache of parsed programs, like __pycache__ for .py files.
+
+    An entry holds the statement list after parsing and the optional optimize and
+    resolve passes, plus the slot names when resolved. It is stored under a
+    SHA-256 of the source, the options, the Python version (for marshal) and
+    interpreter_version(). The directory is kept under `max_bytes` by deleting
+    the least recently used entries. A hit touches the entry's mtime.
+    """
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source, optimize=False, resolve=False):
+        digest = hashlib.sha256()
+        digest.update(f"{interpreter_version()}:{sys.version_info[0]}.{sys.version_info[1]}:"
+                      f"{int(optimize)}{int(resolve)}:".encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".astc")
+
+    def load(self, key):
+        """Returns (statements, names) for a cached key, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as entry:
+                stored_key, kinds, args, names = marshal.load(entry)
+            if stored_key != key:
+                raise ValueError("cache entry does not match its key")
+            statements = decode(kinds, args)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, ValueError, TypeError, IndexError, KeyError):
+            # Truncated or foreign file: drop it and recompile
+            self.misses += 1
+            self.discard(path)
+            return None
+        self.hits += 1
+        return statements, names
+
+    def store(self, key, statements, names=None):
+        """Writes an entry atomically, then trims the directory to max_bytes."""
+        try:
+            kinds, args = encode(statements)
+            data = marshal.dumps((key, kinds, args, names))
+        except (TypeError, ValueError): # Something marshal cannot write; run without caching
+            return False
+
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as entry:
+                entry.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            self.discard(temp_path)
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """Deletes least recently used entries until the directory fits in max_bytes."""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".astc")]
+            stats = [(entry.stat(), entry.path) for entry in entries]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in stats)
+        if total <= self.max_bytes:
+            return
+        for stat, path in sorted(stats, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= stat.st_size
+
+    def clear(self):
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".astc"):
+                    self.discard(entry.path)
+        except OSError:
+            pass
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
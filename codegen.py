@@ -0,0 +1,208 @@
+import sys
+
+from tokens import TokenType
+from ast_nodes import *
+from interpreter import Interpreter
+from arrays import make_array, reduce_value
+
+# Static value types tracked while generating code
+INT, FLOAT, ARRAY, ANY = "int", "float", "array", "any"
+
+# Python operator and precedence used for each language operator
+PYTHON_OPERATORS = {TokenType.PLUS: "+", TokenType.MINUS: "-", TokenType.MUL: "*", TokenType.DIV: "/"}
+PRECEDENCE = {TokenType.PLUS: 1, TokenType.MINUS: 1, TokenType.MUL: 2, TokenType.DIV: 2}
+ATOM = 3 # Names, literals and calls never need parentheses
+
+# Expressions nested deeper than this are emitted one operation per line, so the
+# Python compiler's own nesting limits are never reached
+MAX_NESTING = 100
+
+class CodeGenerator:
+    """Translates a statement list into the source of one Python function.
+
+    The program has no branches, so the assignment that reaches every variable read
+    is known while generating. This gives each read's static type (int, float,
+    array or unknown), and it shows which reads hit an undefined variable. Binary
+    operations on known number types become plain Python operators, and int / int
+    becomes int(a / b). Everything else calls Interpreter.binary_operation, which
+    does the string-to-float coercion and the array rules and errors. Evaluation
+    order is left to right, as in Interpreter.evaluate, so errors appear at the
+    same point. Variables become Python locals.
+    """
+    def __init__(self):
+        self.lines = []
+        self.constants = []  # Values referenced from the code as K[index]
+        self.types = {}      # Variable name -> static type of its current value
+        self.locals = {}     # Variable name -> Python local name
+        self.temporaries = 0
+
+    def generate(self, nodes):
+        for node in nodes:
+            if isinstance(node, list): # Flatten nested statements the same way Interpreter.interpret does
+                for sub_node in node:
+                    self.statement(sub_node)
+            else:
+                self.statement(node)
+
+        assigned = ", ".join(f"{name!r}: {local}" for name, local in self.locals.items())
+        body = "\n".join("    " + line for line in self.lines) or "    pass"
+        return f"def program(output):\n{body}\n    return {{{assigned}}}\n"
+
+    def local(self, name):
+        if name not in self.locals:
+            self.locals[name] = f"v{len(self.locals)}_{name}" if name.isidentifier() else f"v{len(self.locals)}"
+        return self.locals[name]
+
+    def constant(self, value):
+        self.constants.append(value)
+        return f"K[{len(self.constants) - 1}]"
+
+    def statement(self, node):
+        if isinstance(node, AssignNode):
+            code, value_type = self.expression(node.expr)
+            self.lines.append(f"{self.local(node.var)} = {code}")
+            self.types[node.var] = value_type
+
+        elif isinstance(node, PrintNode):
+            code, _ = self.expression(node.expr)
+            self.lines.append(f"print({code}, file=output)")
+
+    def expression(self, node):
+        """Returns (Python code, static type) for an expression, possibly after
+        emitting lines that compute parts of it into temporaries."""
+        # Post-order walk with an explicit stack. Finished operands sit on `values`
+        # as (code, type, precedence, depth) in left-to-right order.
+        values = []
+        pending = [node]
+        while pending:
+            node = pending.pop()
+
+            if isinstance(node, tuple): # A deferred operation: its operands are on `values`
+                kind, payload = node
+                if kind == "binop":
+                    right = values.pop()
+                    left = values.pop()
+                    values.append(self.binop(payload, left, right))
+                elif kind == "array":
+                    elements = values[len(values) - payload:]
+                    del values[len(values) - payload:]
+                    code = f"make_array([{', '.join(element[0] for element in elements)}], output)"
+                    values.append((code, ARRAY, ATOM, max((element[3] for element in elements), default=0) + 1))
+                else: # "reduce"
+                    operand = values.pop()
+                    code = f"reduce_value({self.constant(payload)}, {operand[0]}, output)"
+                    value_type = operand[1] if operand[1] in (INT, FLOAT) else ANY
+                    values.append((code, value_type, ATOM, operand[3] + 1))
+
+                if values[-1][3] > MAX_NESTING:
+                    self.spill(values)
+
+            elif isinstance(node, NumberNode):
+                value = node.value
+                if value.__class__ is int and abs(value) < 10 ** 100: # Huge literals would hit int-to-str limits
+                    values.append((repr(value), INT, ATOM if value >= 0 else 0, 0))
+                elif value.__class__ is float and value == value and abs(value) != float("inf"):
+                    values.append((repr(value), FLOAT, ATOM if value >= 0 else 0, 0))
+                else:
+                    values.append((self.constant(value), ANY, ATOM, 0))
+
+            elif isinstance(node, VarNode):
+                if node.name in self.types:
+                    values.append((self.local(node.name), self.types[node.name], ATOM, 0))
+                else: # Read before any assignment: fails at this point of the evaluation.
+                    # Depth 1, so spill() moves it out ahead of any deep operand to its right.
+                    values.append((f"undefined({node.name!r}, output)", ANY, ATOM, 1))
+
+            elif isinstance(node, BinOpNode):
+                pending.append(("binop", node.op))
+                pending.append(node.right)
+                pending.append(node.left)
+
+            elif isinstance(node, ArrayNode):
+                pending.append(("array", len(node.elements)))
+                pending.extend(reversed(node.elements))
+
+            elif isinstance(node, ReduceNode):
+                pending.append(("reduce", node.op))
+                pending.append(node.operand)
+
+            else:
+                values.append((f"fail({repr(str(type(node)))}, output)", ANY, ATOM, 1))
+
+        code, value_type, _, _ = values.pop()
+        return code, value_type
+
+    def binop(self, op, left, right):
+        left_code, left_type, left_precedence, left_depth = left
+        right_code, right_type, right_precedence, right_depth = right
+        depth = max(left_depth, right_depth) + 1
+        types = (left_type, right_type)
+
+        if op in PYTHON_OPERATORS and ANY not in types and ARRAY not in types:
+            precedence = PRECEDENCE[op]
+            if left_precedence < precedence:
+                left_code = f"({left_code})"
+            if right_precedence <= precedence:
+                right_code = f"({right_code})"
+            code = f"{left_code} {PYTHON_OPERATORS[op]} {right_code}"
+
+            if types == (INT, INT):
+                if op == TokenType.DIV: # Integer operands give an integer result
+                    return f"int({code})", INT, ATOM, depth
+                return code, INT, precedence, depth
+            return code, FLOAT, precedence, depth
+
+        # Unknown types, arrays and unknown operators take the Interpreter's path
+        result_type = ARRAY if ARRAY in types and op in PYTHON_OPERATORS else ANY
+        return f"binary({self.constant(op)}, {left_code}, {right_code})", result_type, ATOM, depth
+
+    def spill(self, values):
+        """Moves every pending operand into a temporary, in left-to-right order, so
+        evaluation order is unchanged and the nesting depth drops back to zero.
+        Only names, literals and constants stay inline (depth 0): evaluating them
+        cannot fail or print."""
+        for index, (code, value_type, precedence, depth) in enumerate(values):
+            if depth == 0:
+                continue
+            name = f"t{self.temporaries}"
+            self.temporaries += 1
+            self.lines.append(f"{name} = {code}")
+            values[index] = (name, value_type, ATOM, 0)
+
+def undefined(name, output):
+    print(f"Error: Variable '{name}' is not defined.", file=output)
+    sys.exit(1)
+
+def fail(node_type, output):
+    print(f"Error: Unknown node type '{node_type}'.", file=output)
+    sys.exit(1)
+
+class CompiledProgram:
+    """A program translated by CodeGenerator and compiled with compile()."""
+    def __init__(self, nodes):
+        generator = CodeGenerator()
+        self.source = generator.generate(nodes)
+        self.constants = generator.constants
+        self.code = compile(self.source, "<program>", "exec")
+
+    def run(self, output=None):
+        """Runs the program and returns its variables."""
+        namespace = {
+            "K": self.constants,
+            "binary": Interpreter(output).binary_operation,
+            "make_array": make_array,
+            "reduce_value": reduce_value,
+            "undefined": undefined,
+            "fail": fail,
+        }
+        exec(self.code, namespace)
+        return namespace["program"](output)
+
+class NativeInterpreter:
+    """Runs programs as compiled Python code; a drop-in for Interpreter.interpret."""
+    def __init__(self, output=None):
+        self.variables = {}
+        self.output = output
+
+    def interpret(self, nodes):
+        self.variables.update(CompiledProgram(nodes).run(self.output))
@@ -0,0 +1,92 @@
+# Longest chain of layers before a new layer flattens its parent. Lookups that miss
+# the top layer walk the chain, so this bounds their cost; flattening costs one copy
+# of the visible bindings every MAX_DEPTH snapshots.
+MAX_DEPTH = 32
+
+class Environment(dict):
+    """Copy-on-write variable bindings: a dict of this layer's own assignments on top
+    of a frozen parent Environment that it shares with other layers.
+
+    A layer is frozen once an interpreter has snapshotted it: nothing writes to it
+    any more, so any number of children can share it and creating one is O(1).
+    Reads of the layer's own bindings are plain dict lookups; other reads walk the
+    parents. The Interpreter only uses `in`, [] and []=, and the mapping views
+    below show every visible binding, for callers that inspect variables.
+    """
+    __slots__ = ("parent", "depth")
+
+    def __init__(self, parent=None):
+        super().__init__()
+        if parent is not None and parent.depth >= MAX_DEPTH:
+            parent = Environment.from_dict(parent.flatten())
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+
+    @classmethod
+    def from_dict(cls, variables):
+        """A root layer holding a copy of `variables`."""
+        environment = cls()
+        dict.update(environment, variables)
+        return environment
+
+    def __missing__(self, name):
+        layer = self.parent
+        while layer is not None:
+            if dict.__contains__(layer, name):
+                return dict.__getitem__(layer, name)
+            layer = layer.parent
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        layer = self
+        while layer is not None:
+            if dict.__contains__(layer, name):
+                return True
+            layer = layer.parent
+        return False
+
+    def flatten(self):
+        """Returns every visible binding as a plain dict."""
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer)
+            layer = layer.parent
+        variables = {}
+        for layer in reversed(layers):
+            variables.update(dict.items(layer))
+        return variables
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def __iter__(self):
+        return iter(self.flatten())
+
+    def __len__(self):
+        return len(self.flatten())
+
+    def keys(self):
+        return self.flatten().keys()
+
+    def values(self):
+        return self.flatten().values()
+
+    def items(self):
+        return self.flatten().items()
+
+    def copy(self):
+        return self.flatten()
+
+    def __eq__(self, other):
+        if isinstance(other, Environment):
+            other = other.flatten()
+        return self.flatten() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Environment({self.flatten()!r})"
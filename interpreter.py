@@ -1,10 +1,21 @@
+import operator
+import sys
+
+from tokens import TokenType, TOKEN_TYPES
 from ast_nodes import *
+from ast_arena import NUMBER_NODE, VAR_NODE, BINOP_NODE, ASSIGN_NODE, PRINT_NODE, ARRAY_NODE, REDUCE_NODE
+from arrays import make_array, is_array, array_division, reduce_value, shape_error
+from environment import Environment
+
+# Operator kinds bound once; attribute access on the enum class is slow in a hot loop
+PLUS, MINUS, MUL, DIV = TokenType.PLUS, TokenType.MINUS, TokenType.MUL, TokenType.DIV
 
 # Interpreter class 
 class Interpreter:
-    def __init__(self):
+    def __init__(self, output=None):
         
         self.variables = {} # Store variables and their assigned values
+        self.output = output # Stream for program output and error messages, stdout when None
 
     def interpret(self, nodes):  # Main function for interpret a list of AST nodes
         for node in nodes:
@@ -14,6 +25,24 @@ class Interpreter:
             else:
                 self.execute(node)
 
+    # Freezes the current variables and returns them as an Environment, in O(1).
+    # Later assignments go to a new layer on top, so the snapshot never changes.
+    def snapshot(self):
+        variables = self.variables
+        if not isinstance(variables, Environment):
+            variables = Environment.from_dict(variables) # One copy, the first time only
+        elif variables.parent is not None and not dict.__len__(variables):
+            return variables.parent # Nothing assigned since the last snapshot
+        self.variables = Environment(variables)
+        return variables
+
+    # A new interpreter whose variables start as a snapshot, shared until it assigns them
+    @classmethod
+    def from_snapshot(cls, snapshot, output=None):
+        interpreter = cls(output)
+        interpreter.variables = Environment(snapshot)
+        return interpreter
+
     # Executes a single AST node
     def execute(self, node):
         if isinstance(node, AssignNode):
@@ -25,7 +54,7 @@ class Interpreter:
         elif isinstance(node, PrintNode):
             # Evaluate the expression and print its value
             value = self.evaluate(node.expr)
-            print(value)
+            print(value, file=self.output)
 
     # Recursively evaluates an AST node and returns the resulting value
     def evaluate(self, node):
@@ -38,35 +67,261 @@ class Interpreter:
             if node.name in self.variables:
                 return self.variables[node.name]
             else:
-                print(f"Error: Variable '{node.name}' is not defined.")
-                exit(1)
+                print(f"Error: Variable '{node.name}' is not defined.", file=self.output)
+                sys.exit(1)
 
         elif isinstance(node, BinOpNode):
             # Recursively evaluate the left and right sides of the binary operation
             left = self.evaluate(node.left)
             right = self.evaluate(node.right)
+            return self.binary_operation(node.op, left, right)
+
+        elif isinstance(node, ArrayNode):
+            # Evaluate every element and pack them into one NumPy array
+            return make_array([self.evaluate(element) for element in node.elements], self.output)
+
+        elif isinstance(node, ReduceNode):
+            return reduce_value(node.op, self.evaluate(node.operand), self.output)
+
+        else:
+            print(f"Error: Unknown node type '{type(node)}'.", file=self.output) # Catch unrecognize node type
+            sys.exit(1)
 
-            # Convert string numbers to float if required
-            left = float(left) if isinstance(left, str) else left
-            right = float(right) if isinstance(right, str) else right
+    # Applies a binary operator to two evaluated operands
+    def binary_operation(self, op, left, right):
+        # Convert string numbers to float if required
+        left = float(left) if isinstance(left, str) else left
+        right = float(right) if isinstance(right, str) else right
 
-            if node.op == 'PLUS':
+        try:
+            if op == PLUS:
                 result = left + right
-            elif node.op == 'MINUS':
+            elif op == MINUS:
                 result = left - right
-            elif node.op == 'MUL':
+            elif op == MUL:
                 result = left * right
-            elif node.op == 'DIV':
+            elif op == DIV:
+                if is_array(left) or is_array(right):
+                    return array_division(left, right)
                 result = left / right
             else:
-                print(f"Error: Unknown operator '{node.op}'.") # Print unknown operators
-                exit(1)
-            
-            if isinstance(left, int) and isinstance(right, int): # If both operands were integers, return an integer value
-                return int(result)
+                print(f"Error: Unknown operator '{op}'.", file=self.output) # Print unknown operators
+                sys.exit(1)
+        except ValueError: # Only arrays raise it, when their shapes do not broadcast
+            shape_error(left, right, self.output)
 
-            return result
+        if isinstance(left, int) and isinstance(right, int): # If both operands were integers, return an integer value
+            return int(result)
+
+        return result
+
+    # Runs statement handles produced by Parser(tokens, builder=ASTArena())
+    def interpret_arena(self, arena, statements):
+        for handle in statements:
+            self.execute_arena(arena, handle)
+
+    # Executes a single statement stored in an arena
+    def execute_arena(self, arena, handle):
+        kind = arena.kinds[handle]
+        if kind == ASSIGN_NODE:
+            value = self.evaluate_arena(arena, arena.lefts[handle])
+            self.variables[arena.names[arena.values[handle]]] = value
+
+        elif kind == PRINT_NODE:
+            value = self.evaluate_arena(arena, arena.lefts[handle])
+            print(value, file=self.output)
+
+    # Evaluates an expression stored in an arena, mirroring evaluate()
+    def evaluate_arena(self, arena, handle):
+        kind = arena.kinds[handle]
+        if kind == NUMBER_NODE:
+            return arena.constants[arena.values[handle]]
+
+        elif kind == VAR_NODE:
+            name = arena.names[arena.values[handle]]
+            if name in self.variables:
+                return self.variables[name]
+            else:
+                print(f"Error: Variable '{name}' is not defined.", file=self.output)
+                sys.exit(1)
+
+        elif kind == BINOP_NODE:
+            left = self.evaluate_arena(arena, arena.lefts[handle])
+            right = self.evaluate_arena(arena, arena.rights[handle])
+            return self.binary_operation(TOKEN_TYPES[arena.ops[handle]], left, right)
+
+        elif kind == ARRAY_NODE:
+            return make_array([self.evaluate_arena(arena, element)
+                               for element in arena.element_lists[arena.values[handle]]], self.output)
+
+        elif kind == REDUCE_NODE:
+            return reduce_value(TOKEN_TYPES[arena.ops[handle]], self.evaluate_arena(arena, arena.lefts[handle]),
+                                self.output)
 
         else:
-            print(f"Error: Unknown node type '{type(node)}'.") # Catch unrecognize node type
-            exit(1)
+            print(f"Error: Unknown node kind '{kind}'.", file=self.output)
+            sys.exit(1)
+
+# Interpreter for programs numbered by resolver.Resolver: variables live in a list
+# indexed by slot, so reading one is a single index with no membership test.
+class SlotInterpreter(Interpreter):
+    def __init__(self, names, output=None):
+        super().__init__(output)
+        self.names = names # Slot index -> variable name, as returned by Resolver.resolve
+        self.slots = [None] * len(names)
+
+    def interpret(self, nodes):
+        try:
+            super().interpret(nodes)
+        finally:
+            # Mirror the slots into the variables dictionary for callers that inspect it
+            for name, value in zip(self.names, self.slots):
+                if value is not None:
+                    self.variables[name] = value
+
+    def execute(self, node):
+        if isinstance(node, AssignNode):
+            self.slots[node.slot] = self.evaluate(node.expr)
+
+        elif isinstance(node, PrintNode):
+            value = self.evaluate(node.expr)
+            print(value, file=self.output)
+
+    def evaluate(self, node):
+        if isinstance(node, NumberNode):
+            return node.value
+
+        elif isinstance(node, VarNode):
+            return self.slots[node.slot]
+
+        elif isinstance(node, BinOpNode):
+            left = self.evaluate(node.left)
+            right = self.evaluate(node.right)
+            return self.binary_operation(node.op, left, right)
+
+        else:
+            return super().evaluate(node) # Reports the unknown node type
+
+    # Slots are numbered for one resolved program, so there is nothing to fork into
+    @classmethod
+    def from_snapshot(cls, snapshot, output=None):
+        raise TypeError("SlotInterpreter keeps variables in resolved slots and cannot start from a snapshot")
+
+# Binary operations a site can specialize, as C-level operator functions
+FAST_OPERATIONS = {PLUS: operator.add, MINUS: operator.sub, MUL: operator.mul, DIV: operator.truediv}
+
+def int_division(left, right):
+    return int(left / right) # Integer operands give an integer result
+
+def specialize(op, left, right):
+    """Returns the function computing `op` on exactly these operand classes the way
+    binary_operation does, or None if the types have no fast path."""
+    left_class, right_class = left.__class__, right.__class__
+    if op not in FAST_OPERATIONS or left_class not in (int, float) or right_class not in (int, float):
+        return None
+    if op == DIV and left_class is int and right_class is int:
+        return int_division
+    # int(result) of int + - * int is the result itself, and mixed or float operands
+    # are never converted, so the plain operation matches binary_operation
+    return FAST_OPERATIONS[op]
+
+class BinOpSite:
+    """Per-BinOpNode specialization state and counters."""
+    __slots__ = ("handler", "left_class", "right_class", "countdown", "hits", "misses", "deopts")
+
+    def __init__(self, countdown):
+        self.handler = None        # Specialized function, None while generic
+        self.left_class = None     # Operand classes the handler is valid for
+        self.right_class = None
+        self.countdown = countdown # Generic executions left before specializing
+        self.hits = 0              # Executions served by the handler
+        self.misses = 0            # Generic executions after the first warmup
+        self.deopts = 0            # Times a class mismatch sent the site back to generic
+
+# Interpreter that specializes each binary operation site to the operand types it
+# sees. After WARMUP generic executions, a site caches a handler for the operand
+# classes it last saw (e.g. operator.add for int + int). A class mismatch runs the
+# generic path and starts a new warmup, and after MAX_DEOPTS type changes the site
+# stays generic. Programs have no loops, so a site only warms up when the same parsed
+# program runs again: pass the same `sites` table to every interpreter that runs it.
+class QuickeningInterpreter(Interpreter):
+    WARMUP = 2
+    MAX_DEOPTS = 4
+
+    def __init__(self, output=None, sites=None):
+        super().__init__(output)
+        self.sites = {} if sites is None else sites # BinOpNode -> BinOpSite, kept off the AST
+
+    def evaluate(self, node):
+        node_class = node.__class__
+        if node_class is NumberNode:
+            return node.value
+
+        elif node_class is VarNode:
+            variables = self.variables
+            if node.name in variables:
+                return variables[node.name]
+            return super().evaluate(node) # Reports the undefined variable
+
+        elif node_class is BinOpNode:
+            left = self.evaluate(node.left)
+            right = self.evaluate(node.right)
+
+            site = self.sites.get(node)
+            if site is None:
+                site = self.sites[node] = BinOpSite(self.WARMUP)
+            elif site.handler is not None:
+                if left.__class__ is site.left_class and right.__class__ is site.right_class:
+                    site.hits += 1
+                    return site.handler(left, right)
+                site.deopts += 1
+                site.handler = None
+                site.countdown = self.WARMUP if site.deopts < self.MAX_DEOPTS else -1
+            if site.deopts or site.countdown < 0:
+                site.misses += 1
+
+            result = self.binary_operation(node.op, left, right)
+            if site.countdown > 0:
+                site.countdown -= 1
+                if site.countdown == 0:
+                    site.handler = specialize(node.op, left, right)
+                    if site.handler is None:
+                        site.countdown = -1 # No fast path for these types; stay generic
+                    else:
+                        site.left_class, site.right_class = left.__class__, right.__class__
+            return result
+
+        return super().evaluate(node)
+
+    def site_stats(self, nodes):
+        """Returns one dict per executed binary operation site in a statement list, in
+        source order: operator, current specialization and counters."""
+        stats = []
+        pending = list(reversed(nodes))
+        while pending:
+            node = pending.pop()
+            if isinstance(node, list):
+                pending.extend(reversed(node))
+            elif isinstance(node, (AssignNode, PrintNode)):
+                pending.append(node.expr)
+            elif isinstance(node, ArrayNode):
+                pending.extend(reversed(node.elements))
+            elif isinstance(node, ReduceNode):
+                pending.append(node.operand)
+            elif isinstance(node, BinOpNode):
+                pending.append(node.right)
+                pending.append(node.left)
+                site = self.sites.get(node)
+                if site is None:
+                    continue
+                specialized = None
+                if site.handler is not None:
+                    specialized = f"{node.op}({site.left_class.__name__}, {site.right_class.__name__})"
+                stats.append({
+                    "op": str(node.op),
+                    "specialized": specialized,
+                    "hits": site.hits,
+                    "misses": site.misses,
+                    "deopts": site.deopts,
+                })
+        return stats
@@ -1,6 +1,86 @@
-from tokens import TokenType
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+from tokens import TokenType, TOKEN_TYPES
+
+# Keyword spellings, looked up once per scanned word instead of probing every keyword.
+KEYWORDS = {
+    "let": TokenType.LET, "print": TokenType.PRINT, "return": TokenType.RETURN,
+    "if": TokenType.IF, "else": TokenType.ELSE, "elif": TokenType.ELIF,
+    "for": TokenType.FOR, "while": TokenType.WHILE, "function": TokenType.FUNCTION,
+    "class": TokenType.CLASS, "import": TokenType.IMPORT, "from": TokenType.FROM,
+    "as": TokenType.AS, "try": TokenType.TRY, "except": TokenType.EXCEPT,
+    "finally": TokenType.FINALLY, "break": TokenType.BREAK, "continue": TokenType.CONTINUE,
+    "pass": TokenType.PASS, "def": TokenType.DEF, "global": TokenType.GLOBAL,
+    "nonlocal": TokenType.NONLOCAL, "raise": TokenType.RAISE, "assert": TokenType.ASSERT,
+    "in": TokenType.IN, "is": TokenType.IS, "lambda": TokenType.LAMBDA,
+    "match": TokenType.MATCH, "case": TokenType.CASE,
+    "and": TokenType.AND, "or": TokenType.OR, "not": TokenType.NOT
+}
+
+# Multi-character operators (like ==, !=, **)
+MULTI_CHAR_OPS = {
+    '==': TokenType.EQUALS, '!=': TokenType.NOT_EQUALS, '<=': TokenType.LESS_EQUAL,
+    '>=': TokenType.GREATER_EQUAL, '**': TokenType.POWER, '//': TokenType.FLOOR_DIV,
+    '+=': TokenType.PLUS_ASSIGN, '-=': TokenType.MINUS_ASSIGN, '*=': TokenType.MUL_ASSIGN,
+    '/=': TokenType.DIV_ASSIGN, '%=': TokenType.MOD_ASSIGN, '**=': TokenType.POWER_ASSIGN,
+    '//=': TokenType.FLOOR_DIV_ASSIGN, '->': TokenType.ARROW, '=>': TokenType.DOUBLE_ARROW,
+    '<<': TokenType.BIT_LSHIFT, '>>': TokenType.BIT_RSHIFT
+}
+
+# Single-character tokens (+, -, *, /, etc.)
+SINGLE_CHAR_MAP = {
+    '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.MUL, '/': TokenType.DIV,
+    '%': TokenType.MODULO, '=': TokenType.ASSIGN, '<': TokenType.LESS_THAN,
+    '>': TokenType.GREATER_THAN, '(': TokenType.LPAREN, ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE, '}': TokenType.RBRACE, '[': TokenType.LBRACKET, ']': TokenType.RBRACKET,
+    ',': TokenType.COMMA, '.': TokenType.DOT, ':': TokenType.COLON, ';': TokenType.SEMICOLON,
+    '&': TokenType.BIT_AND, '|': TokenType.BIT_OR, '^': TokenType.BIT_XOR, '~': TokenType.BIT_NOT,
+    '?': TokenType.QUESTION_MARK, '!': TokenType.EXCLAMATION_MARK
+}
+
+OPERATORS = {**SINGLE_CHAR_MAP, **MULTI_CHAR_OPS}
+
+# One compiled pattern for the whole token grammar. Alternatives are tried in the
+# same order the scanner used to test them, and operators are listed longest first
+# so '**=' wins over '**' and '*'.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<SPACE>\s+)
+  | (?P<COMMENT>\#[^\n]*)
+  | (?P<WORD>[^\W\d]\w*)
+  | (?P<NUMBER>\d+(?:\.\d*)?)
+  | (?P<STRING>"(?P<DQ>(?:[^"\\]|\\.)*\\?)"?|'(?P<SQ>(?:[^'\\]|\\.)*\\?)'?)
+  | (?P<OP>%s)
+  | (?P<ILLEGAL>.)
+""" % "|".join(re.escape(op) for op in sorted(OPERATORS, key=len, reverse=True)),
+    re.VERBOSE | re.DOTALL)
+
+# The same grammar over raw bytes, for BufferLexer. Bytes from 0x80 up are taken to be
+# parts of UTF-8 encoded identifiers; strings and comments never span a newline.
+BYTES_TOKEN_PATTERN = re.compile(rb"""
+    (?P<SPACE>[ \t\n\r\f\v\x1c-\x1f]+)
+  | (?P<COMMENT>\#[^\n]*)
+  | (?P<WORD>[A-Za-z_\x80-\xff][0-9A-Za-z_\x80-\xff]*)
+  | (?P<NUMBER>[0-9]+(?:\.[0-9]*)?)
+  | (?P<STRING>"(?:[^"\\\n]|\\.)*\\?"?|'(?:[^'\\\n]|\\.)*\\?'?)
+  | (?P<OP>%s)
+  | (?P<ILLEGAL>.)
+""" % b"|".join(re.escape(op.encode()) for op in sorted(OPERATORS, key=len, reverse=True)),
+    re.VERBOSE)
+
+BYTES_STRING_PATTERN = re.compile(rb"""
+    "(?P<DQ>(?:[^"\\\n]|\\.)*\\?)"?|'(?P<SQ>(?:[^'\\\n]|\\.)*\\?)'?
+""", re.VERBOSE)
+
+BYTES_KEYWORDS = {word.encode(): token_type for word, token_type in KEYWORDS.items()}
+BYTES_OPERATORS = {op.encode(): token_type for op, token_type in OPERATORS.items()}
 
 class Token:
+    __slots__ = ("type", "value")
+
     def __init__(self, type_, value=None):
         """Represents a token with a type and an optional value."""
         self.type = type_
@@ -10,6 +90,12 @@ class Token:
         """Provides a readable string representation of a token for debugging."""
         return f"Token({self.type}, {repr(self.value)})"
 
+def number_value(num_str):
+    """Converts the text of a NUMBER token to an int or a float."""
+    if '.' in num_str:
+        return float(num_str)
+    return int(num_str)
+
 class Lexer:
     def __init__(self, text):
         """Initializes the lexer with the input text and starting position."""
@@ -40,146 +126,313 @@ class Lexer:
         - Single-character tokens
         - Raises error for illegal characters
         """
-        if self.pos >= len(self.text):
+        match = TOKEN_PATTERN.match(self.text, self.pos)
+        if match is not None and match.lastgroup == "SPACE":
+            match = TOKEN_PATTERN.match(self.text, match.end())
+
+        if match is None:
+            self.pos = len(self.text)
             return Token(TokenType.EOF)
 
-        while self.pos < len(self.text) and self.text[self.pos].isspace():
-            self.pos += 1
+        kind = match.lastgroup
+        self.pos = match.end()
 
-        if self.pos >= len(self.text):
-            return Token(TokenType.EOF)
+        if kind == "WORD":
+            word = match.group()
+            if word in KEYWORDS:
+                return Token(KEYWORDS[word])
+            # A keyword only needs an alphanumeric boundary, so 'let_x' is LET then ID '_x'
+            head = word.partition('_')[0]
+            if head in KEYWORDS:
+                self.pos = match.start() + len(head)
+                return Token(KEYWORDS[head])
+            return Token(TokenType.ID, word)
 
-        current_char = self.text[self.pos]
-
-        # Handle Comments
-        if current_char == '#':
-            start = self.pos
-            while self.pos < len(self.text) and self.text[self.pos] != '\n':
-                self.pos += 1
-            return Token(TokenType.COMMENT, self.text[start:self.pos])
-
-        # Handle Keywords
-        keywords = {
-            "let": TokenType.LET, "print": TokenType.PRINT, "return": TokenType.RETURN,
-            "if": TokenType.IF, "else": TokenType.ELSE, "elif": TokenType.ELIF,
-            "for": TokenType.FOR, "while": TokenType.WHILE, "function": TokenType.FUNCTION,
-            "class": TokenType.CLASS, "import": TokenType.IMPORT, "from": TokenType.FROM,
-            "as": TokenType.AS, "try": TokenType.TRY, "except": TokenType.EXCEPT,
-            "finally": TokenType.FINALLY, "break": TokenType.BREAK, "continue": TokenType.CONTINUE,
-            "pass": TokenType.PASS, "def": TokenType.DEF, "global": TokenType.GLOBAL,
-            "nonlocal": TokenType.NONLOCAL, "raise": TokenType.RAISE, "assert": TokenType.ASSERT,
-            "in": TokenType.IN, "is": TokenType.IS, "lambda": TokenType.LAMBDA,
-            "match": TokenType.MATCH, "case": TokenType.CASE,
-            "and": TokenType.AND, "or": TokenType.OR, "not": TokenType.NOT
-        }
-
-        for keyword, token_type in keywords.items():
-            if self.text.startswith(keyword, self.pos) and \
-               (self.pos + len(keyword) == len(self.text) or not self.text[self.pos + len(keyword)].isalnum()):
-                self.pos += len(keyword)
-                return Token(token_type)
-
-        # Identifiers (variable names)
-        if current_char.isalpha() or current_char == '_':
-            start = self.pos
-            while self.pos < len(self.text) and (self.text[self.pos].isalnum() or self.text[self.pos] == '_'):
-                self.pos += 1
-            return Token(TokenType.ID, self.text[start:self.pos])
-
-        # Numbers (integers and floats)
-        # if current_char.isdigit():
-        #     start = self.pos
-        #     while self.pos < len(self.text) and self.text[self.pos].isdigit():
-        #         self.pos += 1
-        #     if self.pos < len(self.text) and self.text[self.pos] == '.':
-        #         self.pos += 1
-        #         while self.pos < len(self.text) and self.text[self.pos].isdigit():
-        #             self.pos += 1
-        #     return Token(TokenType.NUMBER, self.text[start:self.pos])
-
-        # Inside the Lexer's get_next_token() method (number handling section):
-        if current_char.isdigit():
-            start = self.pos
-            while self.pos < len(self.text) and self.text[self.pos].isdigit():
-                self.pos += 1
-            if self.pos < len(self.text) and self.text[self.pos] == '.':
-                self.pos += 1
-                while self.pos < len(self.text) and self.text[self.pos].isdigit():
-                    self.pos += 1
-            num_str = self.text[start:self.pos]
-            # Convert to int or float
-            if '.' in num_str:
-                value = float(num_str)
-            else:
-                value = int(num_str)
-            return Token(TokenType.NUMBER, value)  # Now stores int/float instead of str
-
-        # String literals
-        if current_char in ('"', "'"):
-            quote = current_char
-            self.pos += 1
-            start = self.pos
-            while self.pos < len(self.text) and self.text[self.pos] != quote:
-                if self.text[self.pos] == '\\' and self.pos + 1 < len(self.text):
-                    self.pos += 2
-                else:
-                    self.pos += 1
-            string_value = self.text[start:self.pos]
-            self.pos += 1
-            return Token(TokenType.STRING, string_value)
-
-        # Multi-character operators (like ==, !=, **)
-        multi_char_ops = {
-            '==': TokenType.EQUALS, '!=': TokenType.NOT_EQUALS, '<=': TokenType.LESS_EQUAL,
-            '>=': TokenType.GREATER_EQUAL, '**': TokenType.POWER, '//': TokenType.FLOOR_DIV,
-            '+=': TokenType.PLUS_ASSIGN, '-=': TokenType.MINUS_ASSIGN, '*=': TokenType.MUL_ASSIGN,
-            '/=': TokenType.DIV_ASSIGN, '%=': TokenType.MOD_ASSIGN, '**=': TokenType.POWER_ASSIGN,
-            '//=': TokenType.FLOOR_DIV_ASSIGN, '->': TokenType.ARROW, '=>': TokenType.DOUBLE_ARROW,
-            '<<': TokenType.BIT_LSHIFT, '>>': TokenType.BIT_RSHIFT
-        }
-
-        for op, token_type in sorted(multi_char_ops.items(), key=lambda x: -len(x[0])):
-            if self.text.startswith(op, self.pos):
-                self.pos += len(op)
-                return Token(token_type)
-
-        # Single-character tokens (+, -, *, /, etc.)
-        single_char_map = {
-            '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.MUL, '/': TokenType.DIV,
-            '%': TokenType.MODULO, '=': TokenType.ASSIGN, '<': TokenType.LESS_THAN,
-            '>': TokenType.GREATER_THAN, '(': TokenType.LPAREN, ')': TokenType.RPAREN,
-            '{': TokenType.LBRACE, '}': TokenType.RBRACE, '[': TokenType.LBRACKET, ']': TokenType.RBRACKET,
-            ',': TokenType.COMMA, '.': TokenType.DOT, ':': TokenType.COLON, ';': TokenType.SEMICOLON,
-            '&': TokenType.BIT_AND, '|': TokenType.BIT_OR, '^': TokenType.BIT_XOR, '~': TokenType.BIT_NOT,
-            '?': TokenType.QUESTION_MARK, '!': TokenType.EXCLAMATION_MARK
-        }
-
-        if current_char in single_char_map:
-            self.pos += 1
-            return Token(single_char_map[current_char])
+        if kind == "OP":
+            return Token(OPERATORS[match.group()])
+
+        if kind == "NUMBER":
+            return Token(TokenType.NUMBER, number_value(match.group()))
+
+        if kind == "STRING":
+            value = match.group("DQ")
+            return Token(TokenType.STRING, match.group("SQ") if value is None else value)
+
+        if kind == "COMMENT":
+            return Token(TokenType.COMMENT, match.group())
 
         # If no valid token found, raise an error
-        raise SyntaxError(f"Illegal character: {current_char}")
+        raise SyntaxError(f"Illegal character: {match.group()}")
 
     def tokenize(self):
-        """Splits the entire input text into a list of token lists, one list per line.
+        """Splits the entire input text into a list of token lists, one list per line."""
+        return self.tokenize_buffer().to_lines()
+
+    def tokenize_buffer(self, buffer=None):
+        """Lexes the entire input text into a TokenBuffer without creating Token objects.
 
         - Processes the input line by line.
-        - Calls get_next_token repeatedly for each line.
-        - Collects all non-EOF tokens for each line.
+        - Runs the master token pattern across each line in a single pass.
+        - Records each line's end so the per-line grouping can be recovered.
+        - Appends to `buffer` when one is given, so a stream can be lexed a line at a time.
+        """
+        if buffer is None:
+            buffer = TokenBuffer()
+        kinds = buffer.kinds
+        values = buffer.values
+        add_kind = kinds.append
+        add_value = values.append
+        end_line = buffer.line_ends.append
+        keywords = KEYWORDS
+        operators = OPERATORS
+        finditer = TOKEN_PATTERN.finditer
+        ID, NUMBER, STRING, COMMENT = TokenType.ID, TokenType.NUMBER, TokenType.STRING, TokenType.COMMENT
+
+        for line in self.text.split("\n"):
+            for match in finditer(line):
+                kind = match.lastgroup
+                if kind == "SPACE":
+                    continue
+                if kind == "WORD":
+                    word = match.group()
+                    if word in keywords:
+                        add_kind(keywords[word])
+                        add_value(None)
+                    elif '_' in word and word.partition('_')[0] in keywords:
+                        head, _, rest = word.partition('_')
+                        add_kind(keywords[head])
+                        add_value(None)
+                        add_kind(ID)
+                        add_value('_' + rest)
+                    else:
+                        add_kind(ID)
+                        add_value(word)
+                elif kind == "OP":
+                    add_kind(operators[match.group()])
+                    add_value(None)
+                elif kind == "NUMBER":
+                    add_kind(NUMBER)
+                    add_value(number_value(match.group()))
+                elif kind == "STRING":
+                    value = match.group("DQ")
+                    add_kind(STRING)
+                    add_value(match.group("SQ") if value is None else value)
+                elif kind == "COMMENT":
+                    add_kind(COMMENT)
+                    add_value(match.group())
+                else:
+                    raise SyntaxError(f"Illegal character: {match.group()}")
+            end_line(len(kinds))
+
+        return buffer
+
+    def tokenize_parallel(self, workers=None, chunk_size=1 << 20):
+        """Lexes the input text on a pool of worker processes into one TokenBuffer.
+
+        The text is cut into chunks of about `chunk_size` characters, each ending just
+        before a newline. Lines never span chunks, so lexing the chunks separately and
+        joining the buffers in order gives exactly the tokens and line ends of
+        tokenize_buffer(). A text of a single chunk, or workers=1, is lexed here.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, not {workers}")
+        text = self.text
+        chunks = []
+        start = 0
+        while len(text) - start > chunk_size:
+            end = text.find("\n", start + chunk_size)
+            if end < 0:
+                break
+            chunks.append(text[start:end])
+            start = end + 1 # The newline itself only separates the chunks' lines
+        chunks.append(text[start:])
+
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers == 1:
+            return self.tokenize_buffer()
+
+        # Imported here: multiprocessing adds ~30 ms to the startup of every main.py run
+        from concurrent.futures import ProcessPoolExecutor
+
+        buffer = TokenBuffer()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_buffer in pool.map(_tokenize_chunk, chunks):
+                buffer.extend(chunk_buffer)
+        return buffer
+
+def _tokenize_chunk(text):
+    return Lexer(text).tokenize_buffer()
+
+class TokenBuffer:
+    """Columnar token storage shared by the lexer and the parser.
+
+    Token kinds are TokenType codes in a byte array and token values sit at the same
+    index in a parallel list. line_ends[i] is the index one past the last token of
+    line i. Token objects are only created on request.
+    """
+    def __init__(self):
+        self.kinds = array('B')
+        self.values = []
+        self.line_ends = array('l')
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def token(self, index):
+        """Returns the token at `index` as a Token object."""
+        return Token(TOKEN_TYPES[self.kinds[index]], self.values[index])
+
+    def extend(self, other):
+        """Appends the tokens and lines of another buffer."""
+        offset = len(self.kinds)
+        self.kinds.extend(other.kinds)
+        self.values.extend(other.values)
+        self.line_ends.extend([end + offset for end in other.line_ends])
+
+    def split(self, index):
+        """Removes the tokens before `index` and returns them as a new buffer. A line
+        cut at `index` ends the returned buffer and continues in this one."""
+        head = TokenBuffer()
+        head.kinds, self.kinds = self.kinds[:index], self.kinds[index:]
+        head.values, self.values = self.values[:index], self.values[index:]
+        lines = bisect_right(self.line_ends, index)
+        head.line_ends = self.line_ends[:lines]
+        if not head.line_ends or head.line_ends[-1] != index:
+            head.line_ends.append(index)
+        self.line_ends = array('l', [end - index for end in self.line_ends[lines:]])
+        return head
+
+    def line_spans(self):
+        """Yields the (start, end) token index range of each line."""
+        start = 0
+        for end in self.line_ends:
+            yield start, end
+            start = end
+
+    def to_lines(self):
+        """Returns a list of Token lists, one list per line, like Lexer.tokenize()."""
+        return [[self.token(index) for index in range(start, end)] for start, end in self.line_spans()]
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """Builds a single-line buffer from any iterable of token objects."""
+        buffer = cls()
+        for token in tokens:
+            buffer.kinds.append(token.type)
+            buffer.values.append(token.value)
+        buffer.line_ends.append(len(buffer.kinds))
+        return buffer
+
+class SpanToken:
+    __slots__ = ("type", "start", "end", "source")
+
+    def __init__(self, type_, start, end, source):
+        """Represents a token by its (start, end) byte offsets into a shared source buffer."""
+        self.type = type_
+        self.start = start
+        self.end = end
+        self.source = source
+
+    @property
+    def text(self):
+        """Decodes the token's lexeme from the source buffer."""
+        return str(self.source[self.start:self.end], "utf-8")
+
+    @property
+    def value(self):
+        """Converts the lexeme to the same value a Token would carry, on demand."""
+        if self.type == TokenType.ID or self.type == TokenType.COMMENT:
+            return self.text
+        if self.type == TokenType.NUMBER:
+            return number_value(self.text)
+        if self.type == TokenType.STRING:
+            match = BYTES_STRING_PATTERN.match(self.source, self.start)
+            content = match.group("DQ")
+            return str(match.group("SQ") if content is None else content, "utf-8")
+        return None
+
+    def __repr__(self):
+        """Provides a readable string representation of a token for debugging."""
+        return f"Token({self.type}, {repr(self.value)})"
+
+class BufferLexer:
+    def __init__(self, buffer):
+        """Initializes the lexer over a bytes, memoryview or mmap of UTF-8 source.
+
+        The buffer is never copied or split; tokens refer back into it by offset.
         """
-        tokenized_output = []
-        lines = self.text.split("\n")
-
-        for line in lines:
-            self.pos = 0
-            self.text = line
-            line_tokens = []
-            while self.pos < len(self.text):
-                token = self.get_next_token()
-                if token.type == TokenType.EOF:
-                    break
-                line_tokens.append(token)
-            tokenized_output.append(line_tokens)
+        self.buffer = buffer
+        self._mapped = None
+
+    @classmethod
+    def from_file(cls, path):
+        """Memory-maps the file at `path` read-only and returns a lexer over it."""
+        with open(path, "rb") as source_file:
+            try:
+                mapped = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files cannot be mapped
+                return cls(b"")
+        lexer = cls(mapped)
+        lexer._mapped = mapped
+        return lexer
+
+    def close(self):
+        """Releases the file mapping created by from_file()."""
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_tokens(self, line_breaks=False):
+        """Yields SpanTokens across the whole buffer in a single pass.
 
+        With line_breaks=True a None is yielded at every newline, which is how
+        tokenize() rebuilds the per-line grouping without splitting the buffer.
+        """
+        buffer = self.buffer
+        keywords = BYTES_KEYWORDS
+        operators = BYTES_OPERATORS
+
+        for match in BYTES_TOKEN_PATTERN.finditer(buffer):
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind == "SPACE":
+                if line_breaks:
+                    for _ in range(match.group().count(b"\n")):
+                        yield None
+                continue
+            if kind == "WORD":
+                word = match.group()
+                if word in keywords:
+                    yield SpanToken(keywords[word], start, end, buffer)
+                elif b"_" in word and word.partition(b"_")[0] in keywords:
+                    head = word.partition(b"_")[0]
+                    yield SpanToken(keywords[head], start, start + len(head), buffer)
+                    yield SpanToken(TokenType.ID, start + len(head), end, buffer)
+                else:
+                    yield SpanToken(TokenType.ID, start, end, buffer)
+            elif kind == "OP":
+                yield SpanToken(operators[match.group()], start, end, buffer)
+            elif kind == "NUMBER":
+                yield SpanToken(TokenType.NUMBER, start, end, buffer)
+            elif kind == "STRING":
+                yield SpanToken(TokenType.STRING, start, end, buffer)
+            elif kind == "COMMENT":
+                yield SpanToken(TokenType.COMMENT, start, end, buffer)
+            else:
+                raise SyntaxError(f"Illegal character: {match.group().decode('latin-1')}")
+
+    def tokenize(self):
+        """Returns a list of SpanToken lists, one list per line, like Lexer.tokenize()."""
+        tokenized_output = [[]]
+        for token in self.iter_tokens(line_breaks=True):
+            if token is None:
+                tokenized_output.append([])
+            else:
+                tokenized_output[-1].append(token)
         return tokenized_output
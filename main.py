@@ -1,10 +1,327 @@
+import argparse
+import math
+import sys
+
+from tokens import TOKEN_TYPES
 from lexer import Lexer
-from parser import Parser
-from interpreter import Interpreter
+from parser import parse_program
+from interpreter import Interpreter, SlotInterpreter
+from optimizer import Optimizer, DeadCodeEliminator
+from resolver import Resolver, ResolveError
+from vm import VM
+from codegen import NativeInterpreter
+from output import BufferedOutput
+from cache import CompileCache
+from repl import interact
+from batch import run_scripts
+from stream import parse_stream
+from profiler import Profile, ProfilingInterpreter, ProfilingSlotInterpreter, phase
+from memory import MemoryProfile, MemoryBudgetExceeded
+
+# Prints the token kinds of each source line
+def print_tokens(tokens, output=None):
+    for start, end in tokens.line_spans():
+        token_types = [TOKEN_TYPES[kind].name for kind in tokens.kinds[start:end]]
+        print(f"[{', '.join(token_types)}]", file=output)
+
+# Prints one AST node per line
+def print_ast(ast, output=None):
+    for node in ast:
+        print(node, file=output)
 
 # This is the main entry point for the program.
-# It takes user input, processes it through the lexer, parser, and interpreter stages, and outputs results.
+# Without file arguments it takes user input and shows every stage; with files it runs them as a batch.
 def main():
+    arg_parser = argparse.ArgumentParser(description="Lex, parse and run programs from files, stdin, or the prompt.")
+    arg_parser.add_argument("files", nargs="*",
+                            help="source files to run in order ('-' reads stdin); without files, code is typed at the prompt")
+    arg_parser.add_argument("--tokens", action="store_true", help="batch mode: print the lexer tokens")
+    arg_parser.add_argument("--ast", action="store_true", help="batch mode: print the (optimized) AST")
+    arg_parser.add_argument("--run", action="store_true",
+                            help="batch mode: run the program (the default when no phase is selected)")
+    arg_parser.add_argument("-O", "--optimize", action="store_true",
+                            help="fold constants, propagate known values and remove dead assignments before running, "
+                                 "and show the optimized AST")
+    arg_parser.add_argument("--resolve", action="store_true",
+                            help="number variables before running and report undefined ones up front")
+    arg_parser.add_argument("-i", "--repl", action="store_true",
+                            help="interactive session that runs each statement as soon as it is entered")
+    arg_parser.add_argument("--reactive", action="store_true",
+                            help="with --repl: a let for a bound variable redefines it and updates what depends on it")
+    arg_parser.add_argument("--cache", action="store_true",
+                            help="batch mode: reuse parsed programs from an on-disk cache keyed by source hash")
+    arg_parser.add_argument("--cache-dir", metavar="DIR",
+                            help="cache directory (implies --cache, default ~/.cache/apl_interpreter)")
+    arg_parser.add_argument("--engine", choices=("tree", "vm", "native"), default="tree",
+                            help="batch mode: run on the tree-walking interpreter (default), the bytecode VM, "
+                                 "or as compiled Python code")
+    arg_parser.add_argument("-j", "--jobs", type=int, metavar="N",
+                            help="batch mode: run the files as independent programs on N worker processes")
+    arg_parser.add_argument("--memory", metavar="FILE",
+                            help="batch mode: write peak and retained allocations, top allocation sites and "
+                                 "token/AST object counts per phase as JSON ('-' for stderr)")
+    arg_parser.add_argument("--memory-budget", type=float, metavar="MB",
+                            help="batch mode: stop with an error once traced allocations exceed MB megabytes")
+    arg_parser.add_argument("--lex-jobs", type=int, metavar="N",
+                            help="batch mode: lex large files in chunks on N worker processes")
+    arg_parser.add_argument("--profile", metavar="FILE",
+                            help="batch mode: write per-phase, per-node and per-operator timings as JSON ('-' for stderr)")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="batch mode: run each statement as soon as it is parsed instead of parsing whole files first")
+    arg_parser.add_argument("--serve", metavar="ADDRESS",
+                            help="evaluate programs sent as JSON lines on a Unix socket path or localhost [HOST:]PORT")
+    arg_parser.add_argument("--max-concurrent", type=int, metavar="N",
+                            help="server mode: programs run at once (default: CPU count)")
+    arg_parser.add_argument("--timeout", type=float, default=10.0, metavar="SECONDS",
+                            help="server mode: longest run time of one program (default: 10)")
+    args = arg_parser.parse_args()
+
+    if args.reactive and not args.repl:
+        arg_parser.error("--reactive only applies to --repl")
+    if args.serve:
+        if args.files or args.repl:
+            arg_parser.error("--serve cannot be combined with files or --repl")
+        if not math.isfinite(args.timeout) or args.timeout <= 0:
+            arg_parser.error("--timeout must be a positive number of seconds")
+        run_server(args)
+        return
+
+    if args.lex_jobs is not None and args.lex_jobs < 1:
+        arg_parser.error("--lex-jobs must be at least 1")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        arg_parser.error("--memory-budget must be a positive number of megabytes")
+    if (args.memory or args.memory_budget is not None) and (args.profile or args.jobs or args.stream or not args.files):
+        arg_parser.error("--memory and --memory-budget only apply to batch runs without --profile, --jobs or --stream")
+    if args.files and args.jobs:
+        if (args.tokens or args.ast or args.profile or args.cache or args.cache_dir or args.engine != "tree"
+                or args.lex_jobs or "-" in args.files):
+            arg_parser.error("--jobs only runs files; it cannot be combined with stdin, "
+                             "--tokens, --ast, --cache, --profile, --engine or --lex-jobs")
+        sys.exit(run_parallel(args))
+    if args.files and args.stream:
+        if (args.tokens or args.ast or args.resolve or args.profile or args.cache or args.cache_dir
+                or args.lex_jobs or args.engine != "tree"):
+            arg_parser.error("--stream only runs files on the tree-walking engine; it cannot be combined with "
+                             "--tokens, --ast, --resolve, --cache, --profile, --lex-jobs or --engine vm/native")
+        sys.exit(run_stream(args))
+    if args.files:
+        sys.exit(run_batch(args))
+    if args.repl:
+        if args.reactive and args.optimize:
+            arg_parser.error("--reactive cannot be combined with -O: propagated constants hide dependencies")
+        interact(args.optimize, args.reactive)
+        return
+    run_interactive(args)
+
+# Runs each file with only the selected phases and no banners. Program output is
+# buffered and written in large blocks. Errors are reported on stderr as "path: ..."
+# and the remaining files still run, as with --jobs. Returns the exit status: 1 if
+# any file could not be read or had a syntax, resolve or run-time error. An exceeded
+# --memory-budget stops the whole batch.
+def run_batch(args):
+    if not (args.tokens or args.ast or args.run):
+        args.run = True
+
+    status = 0
+    cache = CompileCache(args.cache_dir) if args.cache or args.cache_dir else None
+    profile = Profile() if args.profile else None
+    memory = None
+    if args.memory or args.memory_budget is not None:
+        budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget is not None else None
+        memory = MemoryProfile(budget)
+        memory.start()
+    tracker = profile or memory # Phases are either timed or traced; main() rejects both
+    report_path = args.profile or args.memory
+
+    with BufferedOutput(sys.stdout) as output:
+        try:
+            for path in args.files:
+                if len(args.files) > 1 and (args.tokens or args.ast):
+                    print(f"==> {path} <==", file=output)
+
+                try:
+                    with phase(tracker, "read"):
+                        if path == "-":
+                            code = sys.stdin.read()
+                        else:
+                            with open(path) as source:
+                                code = source.read()
+                except OSError as e: # e.g. a missing file; the other files still run
+                    output.flush()
+                    print(f"{path}: Error: {e}", file=sys.stderr)
+                    status = 1
+                    continue
+
+                try:
+                    tokens = None
+                    if args.tokens:
+                        with phase(tracker, "lex"):
+                            tokens = lex(code, args.lex_jobs)
+                        print_tokens(tokens, output)
+                    if not (args.ast or args.run):
+                        continue
+                    ast, names = compile_program(code, args, cache, tokens, tracker, args.lex_jobs)
+                except SyntaxError as e:
+                    output.flush()
+                    print(f"{path}: Syntax Error: {e}", file=sys.stderr)
+                    status = 1
+                    continue
+                except ResolveError as e:
+                    output.flush()
+                    print(f"{path}: Error: {e}", file=sys.stderr)
+                    status = 1
+                    continue
+
+                if args.ast:
+                    print_ast(ast, output)
+                if args.run:
+                    interpreter = make_interpreter(args, names, output, profile)
+                    try:
+                        with phase(tracker, "run"):
+                            interpreter.interpret(ast)
+                    except SystemExit: # The interpreter printed the error as the last line
+                        error = output.pop_line()
+                        output.flush()
+                        print(f"{path}: {error}", file=sys.stderr)
+                        status = 1
+                    except MemoryBudgetExceeded:
+                        raise
+                    except Exception as e: # e.g. ZeroDivisionError or a NumPy shape error from the program
+                        output.flush()
+                        print(f"{path}: Error: {type(e).__name__}: {e}", file=sys.stderr)
+                        status = 1
+            if memory is not None:
+                memory.stop()
+                memory.check() # Exceeded in the last phase after it ended
+        except MemoryBudgetExceeded as e:
+            output.flush()
+            print(f"{path}: Error: {e}", file=sys.stderr)
+            status = 1
+        finally:
+            if memory is not None:
+                memory.stop()
+
+    if tracker is not None and report_path:
+        write_profile(tracker, report_path)
+    return status
+
+# Runs each file while it is being read: lines are lexed and parsed a statement at a
+# time and every statement runs before the next is parsed, so memory stays bounded by
+# the largest statement. A syntax or run-time error stops its file after the
+# statements before it have run and is reported as in run_batch.
+def run_stream(args):
+    status = 0
+    with BufferedOutput(sys.stdout) as output:
+        for path in args.files:
+            interpreter = Interpreter(output)
+            optimizer = Optimizer() if args.optimize else None
+            try:
+                if path == "-":
+                    interpreter.interpret(parse_stream(sys.stdin, optimizer))
+                else:
+                    with open(path) as source:
+                        interpreter.interpret(parse_stream(source, optimizer))
+            except SyntaxError as e:
+                output.flush()
+                print(f"{path}: Syntax Error: {e}", file=sys.stderr)
+                status = 1
+            except SystemExit:
+                error = output.pop_line()
+                output.flush()
+                print(f"{path}: {error}", file=sys.stderr)
+                status = 1
+            except OSError as e:
+                output.flush()
+                print(f"{path}: Error: {e}", file=sys.stderr)
+                status = 1
+            except Exception as e: # e.g. ZeroDivisionError or a NumPy shape error from the program
+                output.flush()
+                print(f"{path}: Error: {type(e).__name__}: {e}", file=sys.stderr)
+                status = 1
+    return status
+
+# Picks the engine for --engine, --resolve and --profile. Only the tree-walking
+# interpreter uses resolved slots and records per-node profiles.
+def make_interpreter(args, names, output, profile=None):
+    if args.engine == "vm":
+        return VM(output)
+    if args.engine == "native":
+        return NativeInterpreter(output)
+    if profile is not None:
+        if args.resolve:
+            return ProfilingSlotInterpreter(names, output, profile=profile)
+        return ProfilingInterpreter(output, profile=profile)
+    return SlotInterpreter(names, output) if args.resolve else Interpreter(output)
+
+# Runs every file on a process pool. Output is printed in file order. A failing file
+# prints its error to stderr and does not stop the others.
+def run_parallel(args):
+    status = 0
+    with BufferedOutput(sys.stdout) as output:
+        for result in run_scripts(args.files, args.jobs, args.optimize, args.resolve):
+            output.write(result.output)
+            if result.error is not None:
+                output.flush()
+                print(f"{result.path}: {result.error}", file=sys.stderr)
+            status = max(status, result.status)
+    return status
+
+# Serves evaluation requests until interrupted. asyncio is imported here so that it
+# does not slow down the startup of every other mode.
+def run_server(args):
+    import asyncio
+    from server import serve
+
+    try:
+        asyncio.run(serve(args.serve, args.max_concurrent, args.timeout))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as e: # e.g. the address is in use or not on localhost
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def write_profile(profile, path):
+    if path == "-":
+        print(profile.to_json(), file=sys.stderr)
+    else:
+        with open(path, "w") as profile_file:
+            profile_file.write(profile.to_json() + "\n")
+
+def lex(code, lex_jobs=None):
+    if lex_jobs:
+        return Lexer(code).tokenize_parallel(lex_jobs)
+    return Lexer(code).tokenize_buffer()
+
+# Parses a program and applies the -O and --resolve passes, or loads the result from
+# the cache, lexing on `lex_jobs` processes when given. Returns the statement list and
+# the slot names (None without --resolve).
+def compile_program(code, args, cache=None, tokens=None, profile=None, lex_jobs=None):
+    if cache is not None:
+        key = cache.key(code, args.optimize, args.resolve)
+        with phase(profile, "cache"):
+            program = cache.load(key)
+        if program is not None:
+            return program
+
+    if tokens is None:
+        with phase(profile, "lex"):
+            tokens = lex(code, lex_jobs)
+    with phase(profile, "parse"):
+        ast = parse_program(tokens)
+    if args.optimize:
+        with phase(profile, "optimize"):
+            ast = DeadCodeEliminator().eliminate(Optimizer().optimize(ast))
+    names = None
+    if args.resolve:
+        with phase(profile, "resolve"):
+            names = Resolver().resolve(ast)
+
+    if cache is not None:
+        cache.store(key, ast, names)
+    return ast, names
+
+# Reads a program at the prompt and prints the output of every stage
+def run_interactive(args):
     print("Enter your code (type 'end' to finish):")
     
     # Collect lines of code from the user until they type 'end'
@@ -21,32 +338,48 @@ def main():
     #      LEXER PHASE
     print("\n====== Lexer Output ======")
     lexer = Lexer(code)
-    tokenized_output = lexer.tokenize()
+    tokens = lexer.tokenize_buffer()
 
     # Print out the token types for each line of code
-    for line_tokens in tokenized_output:
-        token_types = [token.type for token in line_tokens]
-        print(f"[{', '.join(token_types)}]")
+    print_tokens(tokens)
 
     #      PARSER PHASE
     print("\n====== Parser (AST) Output ======")
     try:
-        # Flatten the list of token lists into a single list of tokens for parsing
-        parser = Parser([token for line in tokenized_output for token in line])
-        ast = parser.parse()
+        # The parser reads the token buffer's columns directly, across all lines
+        ast = parse_program(tokens)
 
         # Print out the AST nodes for inspection
-        for node in ast:
-            print(node)
+        print_ast(ast)
 
     except SyntaxError as e:
         # If there's a syntax error, display it and stop execution
         print(f"Syntax Error: {e}")
         return
 
+    #      OPTIMIZER PHASE
+    if args.optimize:
+        print("\n====== Optimized AST Output ======")
+        optimizer = Optimizer()
+        eliminator = DeadCodeEliminator()
+        ast = eliminator.eliminate(optimizer.optimize(ast))
+
+        print_ast(ast)
+        print(f"({optimizer.folded} operations folded, {optimizer.propagated} variables propagated, "
+              f"{eliminator.removed_statements} dead statements with {eliminator.removed_nodes} nodes removed)")
+
+    #      RESOLVER PHASE
+    if args.resolve:
+        try:
+            interpreter = SlotInterpreter(Resolver().resolve(ast))
+        except ResolveError as e:
+            print(f"\nError: {e}")
+            return
+    else:
+        interpreter = Interpreter()
+
     #     INTERPRETER PHASE
     print("\n====== Interpreter Execution Output ======")
-    interpreter = Interpreter()
     interpreter.interpret(ast)
 
 # If this script is being run directly (not imported), execute main()
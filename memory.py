@@ -0,0 +1,176 @@
+import _thread
+import gc
+import json
+import signal
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from ast_nodes import *
+from ast_arena import ASTArena
+from lexer import Token, SpanToken, TokenBuffer
+from environment import Environment
+
+# Classes whose live instances are counted at the end of every phase
+COUNTED_CLASSES = (Token, SpanToken, TokenBuffer, NumberNode, VarNode, BinOpNode, AssignNode, PrintNode,
+                   ArrayNode, ReduceNode, ASTArena, Environment)
+
+# Allocations made while taking snapshots, left out of the allocation sites
+IGNORED_FILES = (tracemalloc.__file__, __file__)
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+class MemoryProfile:
+    """Allocations of each pipeline phase, traced with tracemalloc.
+
+    Every phase() records, in bytes, the highest traced memory above its starting
+    point (peak) and what it left allocated (retained). It also records the live
+    Token, TokenBuffer, AST node and Environment objects at its end, and the
+    source lines whose retained memory grew the most since the previous phase
+    ended. Phases are kept in the order they ran.
+
+    With a budget in bytes, a watcher thread samples the traced memory every
+    `interval` seconds and interrupts the main thread once the budget is
+    exceeded: a SIGINT handler raises MemoryBudgetExceeded in the running phase,
+    or phase() raises it if the interrupt arrives after the phase ended. The
+    phase's allocations are released as the stack unwinds. Tracing slows allocation down
+    several times, so this is opt-in and separate from profiler.Profile.
+    """
+    def __init__(self, budget=None, top=10, interval=0.01):
+        if budget is not None and budget <= 0:
+            raise ValueError(f"memory budget must be positive, not {budget}")
+        self.budget = budget
+        self.top = top           # Allocation sites kept per phase; 0 skips the snapshots
+        self.interval = interval
+        self.phases = []
+        self.exceeded = None     # {"phase": name, "traced": bytes} once the budget was hit
+        self.raised = False      # MemoryBudgetExceeded was raised for self.exceeded
+        self.running = None      # Name of the phase in progress
+        self.lines = {}          # (file, line) -> (bytes, blocks) traced at the end of the last phase
+        self.stopped = threading.Event()
+        self.watcher = None
+        self.sigint = None       # SIGINT handler replaced while the watcher runs
+
+    def start(self):
+        tracemalloc.start()
+        # The watcher interrupts the main thread, so it needs the SIGINT handler there
+        if self.budget is not None and threading.current_thread() is threading.main_thread():
+            self.sigint = signal.signal(signal.SIGINT, self.interrupted)
+            self.watcher = threading.Thread(target=self.watch, daemon=True)
+            self.watcher.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.watcher is not None:
+            self.watcher.join()
+            self.watcher = None
+            signal.signal(signal.SIGINT, self.sigint) # Runs a pending interrupt first
+            self.sigint = None
+        tracemalloc.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def watch(self):
+        while not self.stopped.wait(self.interval):
+            traced, _ = tracemalloc.get_traced_memory()
+            running = self.running
+            if traced > self.budget and running is not None:
+                self.exceeded = {"phase": running, "traced": traced}
+                _thread.interrupt_main() # Runs interrupted() in the main thread
+                return
+
+    def interrupted(self, signum, frame):
+        """SIGINT handler. The watcher's interrupt raises MemoryBudgetExceeded inside
+        a running phase; outside one, phase() raises it when it checks the flag.
+        A real Ctrl-C goes to the previous handler."""
+        if self.exceeded is None:
+            if callable(self.sigint):
+                return self.sigint(signum, frame)
+            raise KeyboardInterrupt
+        if self.running is not None:
+            self.check()
+
+    def check(self):
+        """Raises MemoryBudgetExceeded once if the budget was exceeded."""
+        if self.exceeded is not None and not self.raised:
+            self.raised = True
+            raise MemoryBudgetExceeded(f"memory budget of {self.budget} bytes exceeded during "
+                                       f"{self.exceeded['phase']} ({self.exceeded['traced']} bytes traced)")
+
+    @contextmanager
+    def phase(self, name):
+        self.check() # Exceeded after the previous phase ended
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.running = name
+        try:
+            yield
+        finally:
+            self.running = None
+            traced, peak = tracemalloc.get_traced_memory()
+            record = {"phase": name, "peak": peak - start, "retained": traced - start, "traced": traced}
+            if self.top:
+                record["sites"] = self.grown_sites()
+            record["objects"] = self.count_objects()
+            self.phases.append(record)
+
+        if self.budget is not None and traced > self.budget and self.exceeded is None: # Crossed between two samples
+            self.exceeded = {"phase": name, "traced": traced}
+        self.check()
+
+    def grown_sites(self):
+        """The `top` source lines whose traced memory grew the most since the last call.
+
+        One snapshot per phase, compared with the per-line totals kept from the
+        previous one. Snapshot.compare_to and filter_traces would cost several
+        seconds per phase on large inputs.
+        """
+        lines = {}
+        for stat in tracemalloc.take_snapshot().statistics("lineno"):
+            frame = stat.traceback[0]
+            if frame.filename not in IGNORED_FILES:
+                lines[frame.filename, frame.lineno] = (stat.size, stat.count)
+        grown = []
+        for key, (size, count) in lines.items():
+            old_size, old_count = self.lines.get(key, (0, 0))
+            if size > old_size:
+                grown.append({"file": key[0], "line": key[1], "size": size - old_size, "count": count - old_count})
+        self.lines = lines
+        grown.sort(key=lambda site: -site["size"])
+        return grown[:self.top]
+
+    def count_objects(self):
+        counts = {}
+        tokens = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, COUNTED_CLASSES):
+                name = type(obj).__name__
+                counts[name] = counts.get(name, 0) + 1
+                if name == "TokenBuffer":
+                    tokens += len(obj)
+        if tokens:
+            counts["tokens in TokenBuffers"] = tokens
+        return counts
+
+    def to_dict(self):
+        return {"budget": self.budget, "exceeded": self.exceeded, "phases": self.phases}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def report(self):
+        """Returns a readable summary in phase order."""
+        lines = ["phase               peak KB   retained KB"]
+        for record in self.phases:
+            lines.append(f"{record['phase']:<14}{record['peak'] / 1024:13.1f}{record['retained'] / 1024:14.1f}")
+            for name, count in record["objects"].items():
+                lines.append(f"    {count:10} {name}")
+        if self.exceeded is not None:
+            lines.append(f"budget of {self.budget} bytes exceeded during {self.exceeded['phase']}")
+        return "\n".join(lines)
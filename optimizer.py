@@ -0,0 +1,215 @@
+import operator
+
+from tokens import TokenType
+from ast_nodes import *
+
+# Operators the optimizer knows how to evaluate ahead of time
+FOLDABLE_OPS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.MUL: operator.mul,
+    TokenType.DIV: operator.truediv,
+}
+
+def fold_binop(op, left, right):
+    """Computes a binary operation on constants exactly as Interpreter.evaluate would."""
+    # Convert string numbers to float if required
+    left = float(left) if isinstance(left, str) else left
+    right = float(right) if isinstance(right, str) else right
+
+    result = FOLDABLE_OPS[op](left, right)
+
+    if isinstance(left, int) and isinstance(right, int): # If both operands were integers, return an integer value
+        return int(result)
+    return result
+
+class Optimizer:
+    """Constant folding and constant propagation over a parsed statement list.
+
+    Literal arithmetic is computed once, and a variable whose current value is a
+    known constant is replaced by that constant in later expressions. Anything
+    that would fail at run time (division by zero, undefined variables, unknown
+    operators) is left in place so the Interpreter still reports it.
+    """
+    def __init__(self):
+        self.constants = {} # Variables whose current value is known at this point of the program
+        self.folded = 0     # BinOpNodes replaced by their value
+        self.propagated = 0 # VarNodes replaced by a known constant
+
+    def optimize(self, nodes):
+        optimized = []
+        for node in nodes:
+            if isinstance(node, list): # Flatten nested statements the same way Interpreter.interpret does
+                for sub_node in node:
+                    optimized.append(self.optimize_statement(sub_node))
+            else:
+                optimized.append(self.optimize_statement(node))
+        return optimized
+
+    def optimize_statement(self, node):
+        if isinstance(node, AssignNode):
+            expr = self.optimize_expression(node.expr)
+            if isinstance(expr, NumberNode):
+                self.constants[node.var] = expr.value
+            else:
+                self.constants.pop(node.var, None)
+            return node if expr is node.expr else AssignNode(node.var, expr)
+
+        elif isinstance(node, PrintNode):
+            expr = self.optimize_expression(node.expr)
+            return node if expr is node.expr else PrintNode(expr)
+
+        # Anything else is ignored by the Interpreter and is passed through untouched
+        return node
+
+    def optimize_expression(self, node):
+        if isinstance(node, VarNode):
+            if node.name in self.constants:
+                self.propagated += 1
+                return NumberNode(self.constants[node.name])
+            return node
+
+        elif isinstance(node, BinOpNode):
+            left = self.optimize_expression(node.left)
+            right = self.optimize_expression(node.right)
+
+            if isinstance(left, NumberNode) and isinstance(right, NumberNode) and node.op in FOLDABLE_OPS:
+                try:
+                    value = fold_binop(node.op, left.value, right.value)
+                except (ArithmeticError, ValueError, TypeError):
+                    pass # Leave the error for the Interpreter to report at run time
+                else:
+                    self.folded += 1
+                    return NumberNode(value)
+
+            if left is node.left and right is node.right:
+                return node
+            return BinOpNode(left, node.op, right)
+
+        elif isinstance(node, ArrayNode):
+            elements = [self.optimize_expression(element) for element in node.elements]
+            if all(new is old for new, old in zip(elements, node.elements)):
+                return node
+            return ArrayNode(elements)
+
+        elif isinstance(node, ReduceNode):
+            operand = self.optimize_expression(node.operand)
+            return node if operand is node.operand else ReduceNode(node.op, operand)
+
+        return node
+
+class DeadCodeEliminator:
+    """Whole-program liveness analysis that removes dead assignments.
+
+    Statements are walked backwards while tracking the variables a later kept
+    statement still reads. An assignment to a variable outside that set is never
+    observed by a print and is dropped, unless evaluating it could stop the program:
+    reading a variable not assigned by an earlier statement, division (zero
+    divisors), unknown operators, or anything involving arrays (NumPy may be
+    missing and shapes may not broadcast). Such assignments stay, so the
+    Interpreter still reports the same error at the same point.
+    """
+    def __init__(self):
+        self.removed_statements = 0
+        self.removed_nodes = 0
+
+    def eliminate(self, nodes):
+        # Flatten nested statements the same way Interpreter.interpret does
+        statements = []
+        for node in nodes:
+            if isinstance(node, list):
+                statements.extend(node)
+            else:
+                statements.append(node)
+
+        first_assignment = {} # Variable name -> index of the first statement assigning it
+        for index, node in enumerate(statements):
+            if isinstance(node, AssignNode):
+                first_assignment.setdefault(node.var, index)
+        array_variables = self.array_variables(statements)
+
+        live = set()
+        kept = []
+        for index in range(len(statements) - 1, -1, -1):
+            node = statements[index]
+            if isinstance(node, AssignNode):
+                reads, size, safe = self.inspect(node.expr, index, first_assignment, array_variables)
+                if node.var not in live and safe:
+                    self.removed_statements += 1
+                    self.removed_nodes += size + 1
+                    continue
+                live.discard(node.var)
+                live.update(reads)
+            elif isinstance(node, PrintNode):
+                live.update(self.inspect(node.expr, index, first_assignment, array_variables)[0])
+            kept.append(node)
+        kept.reverse()
+        return kept
+
+    def array_variables(self, statements):
+        """Names that may hold an array at some point, found by iterating to a fixed point."""
+        arrays = set()
+        changed = True
+        while changed:
+            changed = False
+            for node in statements:
+                if isinstance(node, AssignNode) and node.var not in arrays and self.may_be_array(node.expr, arrays):
+                    arrays.add(node.var)
+                    changed = True
+        return arrays
+
+    def may_be_array(self, node, arrays):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, (ArrayNode, ReduceNode)):
+                return True
+            if isinstance(node, VarNode) and node.name in arrays:
+                return True
+            if isinstance(node, BinOpNode):
+                pending.append(node.left)
+                pending.append(node.right)
+        return False
+
+    def inspect(self, node, index, first_assignment, array_variables):
+        """Returns (variables read, node count, True if evaluation cannot fail) for the
+        expression of statement number `index`."""
+        reads = set()
+        size = 0
+        safe = True
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            size += 1
+            if isinstance(node, VarNode):
+                reads.add(node.name)
+                if first_assignment.get(node.name, index) >= index or node.name in array_variables:
+                    safe = False
+            elif isinstance(node, BinOpNode):
+                if node.op not in FOLDABLE_OPS or node.op == TokenType.DIV:
+                    safe = False
+                pending.append(node.left)
+                pending.append(node.right)
+            elif isinstance(node, NumberNode):
+                if isinstance(node.value, str):
+                    try:
+                        float(node.value)
+                    except ValueError:
+                        safe = False
+            elif isinstance(node, ArrayNode):
+                safe = False
+                pending.extend(node.elements)
+            elif isinstance(node, ReduceNode):
+                safe = False
+                pending.append(node.operand)
+            else:
+                safe = False
+        return reads, size, safe
+
+def optimize(nodes):
+    """Returns an optimized copy of a parsed statement list."""
+    return Optimizer().optimize(nodes)
+
+def eliminate_dead_code(nodes):
+    """Returns a flat copy of a statement list without its dead assignments."""
+    return DeadCodeEliminator().eliminate(nodes)
@@ -0,0 +1,51 @@
+import sys
+
+class BufferedOutput:
+    """Write-only text stream that collects program output in memory.
+
+    print(value, file=output) only appends to a list; the text is joined and
+    written to the underlying stream once `limit` characters have accumulated,
+    and on flush() or when a `with` block ends, including one left by exit().
+    Writes past the limit keep the last line back, so an error line printed just
+    before exit() can still be taken back with pop_line().
+    """
+    def __init__(self, stream=None, limit=1 << 16):
+        self.stream = stream if stream is not None else sys.stdout
+        self.limit = limit
+        self.chunks = []
+        self.size = 0
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.size >= self.limit:
+            self.flush(hold_last_line=True)
+        return len(text)
+
+    def flush(self, hold_last_line=False):
+        if self.chunks:
+            text = "".join(self.chunks)
+            cut = len(text)
+            if hold_last_line:
+                cut = text.rfind("\n", 0, len(text) - 1) + 1
+                if not cut and not text.endswith("\n"):
+                    cut = len(text) # A long unfinished line goes out whole
+            self.stream.write(text[:cut])
+            self.chunks = [text[cut:]] if cut < len(text) else []
+            self.size = len(text) - cut
+        self.stream.flush()
+
+    def pop_line(self):
+        """Removes the last line that has not been written yet and returns it
+        without its newline, or returns "" if there is none."""
+        text = "".join(self.chunks).rstrip("\n")
+        text, _, line = text.rpartition("\n")
+        self.chunks = [text + "\n"] if text else []
+        self.size = len(self.chunks[0]) if self.chunks else 0
+        return line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
@@ -1,19 +1,61 @@
-from tokens import TokenType
-from ast_nodes import NumberNode, VarNode, BinOpNode, AssignNode, PrintNode
+from tokens import TokenType, TOKEN_TYPES
+from lexer import TokenBuffer
+from ast_nodes import NodeBuilder
+
+# Kind codes the parser tests, bound once as plain ints; attribute access on the enum
+# class costs more than the comparison itself.
+LET, PRINT, ID, NUMBER = int(TokenType.LET), int(TokenType.PRINT), int(TokenType.ID), int(TokenType.NUMBER)
+ASSIGN, COMMA, SEMICOLON = int(TokenType.ASSIGN), int(TokenType.COMMA), int(TokenType.SEMICOLON)
+LPAREN, RPAREN = int(TokenType.LPAREN), int(TokenType.RPAREN)
+LBRACKET, RBRACKET, DIV = int(TokenType.LBRACKET), int(TokenType.RBRACKET), int(TokenType.DIV)
+ADDITIVE_OPS = frozenset((TokenType.PLUS, TokenType.MINUS))
+MULTIPLICATIVE_OPS = frozenset((TokenType.MUL, TokenType.DIV))
+# Operators that form an APL-style reduction when followed by '/', as in +/ x
+REDUCTION_OPS = frozenset((TokenType.PLUS, TokenType.MINUS, TokenType.MUL))
+
+# Binding power of each binary operator for PrecedenceParser; higher binds tighter.
+# Supporting another TokenType operator (MODULO, POWER, FLOOR_DIV, bitwise, comparisons)
+# only takes an entry here, plus RIGHT_ASSOCIATIVE for operators such as POWER that
+# group right to left.
+BINARY_PRECEDENCE = {
+    TokenType.PLUS: 10, TokenType.MINUS: 10,
+    TokenType.MUL: 20, TokenType.DIV: 20,
+}
+RIGHT_ASSOCIATIVE = frozenset()
+
+# A reduction prefix binds tighter than any binary operator: +/ x * 2 is (+/ x) * 2.
+# On the operator stack it is stored as its operator kind plus REDUCTION_MARK.
+REDUCTION_BINDING = 1000
+REDUCTION_MARK = 1000
 
 class Parser:
-    def __init__(self, tokens):
+    def __init__(self, tokens, builder=None):
+        """Parses a TokenBuffer, reading its kind and value columns directly. A flat
+        list of tokens is also accepted and packed into a buffer first.
+
+        Nodes are created through `builder`, which defaults to the ast_nodes objects;
+        pass an ASTArena to build a compact arena instead."""
+        if not isinstance(tokens, TokenBuffer):
+            tokens = TokenBuffer.from_tokens(tokens)
         self.tokens = tokens
+        self.kinds = tokens.kinds
+        self.values = tokens.values
+        self.length = len(tokens.kinds)
         self.pos = 0
+        self.builder = builder if builder is not None else NodeBuilder()
 
     def consume(self):
         """Move to the next token safely."""
-        if self.pos < len(self.tokens):
+        if self.pos < self.length:
             self.pos += 1
 
+    def current_kind(self):
+        """Return the current token kind or None if at the end."""
+        return self.kinds[self.pos] if self.pos < self.length else None
+
     def current_token(self):
         """Return the current token or None if at the end."""
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        return self.tokens.token(self.pos) if self.pos < self.length else None
 
     # def parse(self):
     #     """Parse the tokenized input and construct an AST."""
@@ -31,9 +73,9 @@ class Parser:
     def parse(self):
         """Parse the tokenized input and construct an AST."""
         nodes = []
-        while self.current_token() is not None:
+        while self.pos < self.length:
             node = self.statement()
-            if node:
+            if node is not None: # Arena handles are integers, so 0 is a valid node
                 if isinstance(node, list):
                     nodes.extend(node)  # Flatten lists
                 else:
@@ -44,16 +86,16 @@ class Parser:
 
     def statement(self):
         """Parse a single statement."""
-        token = self.current_token()
-        if token is None:
+        kind = self.current_kind()
+        if kind is None:
             return None
 
-        if token.type == TokenType.LET:
+        if kind == LET:
             return self.assignment()
-        elif token.type == TokenType.PRINT:
+        elif kind == PRINT:
             return self.print_statement()
         else:
-            raise SyntaxError(f"Unexpected token: {token}")
+            raise SyntaxError(f"Unexpected token: {self.current_token()}")
 
     def assignment(self):
         """Parse assignment statements like 'let x = 10;' and 'let a = 10, b = 20;'"""
@@ -61,27 +103,27 @@ class Parser:
         assignments = []
 
         while True:
-            if self.current_token().type != TokenType.ID:
+            if self.current_kind() != ID:
                 raise SyntaxError("Expected variable name in assignment")
 
-            var_name = self.current_token().value
+            var_name = self.values[self.pos]
             self.consume()  # Consume variable name
 
-            if self.current_token().type != TokenType.ASSIGN:
+            if self.current_kind() != ASSIGN:
                 raise SyntaxError("Expected '=' in assignment")
 
             self.consume()  # Consume '='
             expr = self.expression()  # Parse the expression
 
-            assignments.append(AssignNode(var_name, expr))
+            assignments.append(self.builder.assign(var_name, expr))
 
             # Handle multiple assignments (comma-separated)
-            if self.current_token().type == TokenType.COMMA:
+            if self.current_kind() == COMMA:
                 self.consume()  # Consume ','
                 continue  # Continue parsing next assignment
 
             # Ensure assignment ends with a semicolon
-            elif self.current_token().type == TokenType.SEMICOLON:
+            elif self.current_kind() == SEMICOLON:
                 self.consume()  # Consume ';'
                 return assignments
 
@@ -94,22 +136,22 @@ class Parser:
         self.consume()  # Consume 'print'
         expr = self.expression()
 
-        if self.current_token() and self.current_token().type == TokenType.SEMICOLON:
+        if self.current_kind() == SEMICOLON:
             self.consume()  # Consume ';'
         else:
             raise SyntaxError("Expected ';' at the end of the print statement")
 
-        return PrintNode(expr=expr)
+        return self.builder.print_(expr)
 
     def expression(self):
         """Parse addition and subtraction expressions."""
         left = self.term()  # Start with a term (handles multiplication, division, and parentheses)
 
-        while self.current_token() and self.current_token().type in (TokenType.PLUS, TokenType.MINUS):
-            op = self.current_token().type
+        while self.current_kind() in ADDITIVE_OPS:
+            op = TOKEN_TYPES[self.kinds[self.pos]]
             self.consume()
             right = self.term()
-            left = BinOpNode(left, op, right)  # Construct a binary operation node
+            left = self.builder.binop(left, op, right)  # Construct a binary operation node
 
         return left
 
@@ -117,37 +159,173 @@ class Parser:
         """Parse multiplication and division expressions."""
         left = self.factor()  # Start with a factor (numbers, variables, parentheses)
 
-        while self.current_token() and self.current_token().type in (TokenType.MUL, TokenType.DIV):
-            op = self.current_token().type
+        while self.current_kind() in MULTIPLICATIVE_OPS:
+            op = TOKEN_TYPES[self.kinds[self.pos]]
             self.consume()
             right = self.factor()
-            left = BinOpNode(left, op, right)  # Construct a binary operation node
+            left = self.builder.binop(left, op, right)  # Construct a binary operation node
 
         return left
 
+    def starts_reduction(self):
+        """Return True if the tokens at the current position are a reduction prefix like '+/'."""
+        return (self.current_kind() in REDUCTION_OPS and self.pos + 1 < self.length
+                and self.kinds[self.pos + 1] == DIV)
+
+    def array_literal(self):
+        """Parse an array literal: [expr, expr, ...]"""
+        self.consume()  # Consume '['
+        elements = []
+
+        if self.current_kind() != RBRACKET:
+            while True:
+                elements.append(self.expression())
+                if self.current_kind() != COMMA:
+                    break
+                self.consume()  # Consume ','
+
+        if self.current_kind() == RBRACKET:
+            self.consume()  # Consume ']'
+            return self.builder.array(elements)
+        else:
+            raise SyntaxError("Expected ']' after array elements")
+
     def factor(self):
-        """Parse numbers, variables, or parenthesized expressions."""
-        token = self.current_token()
-        if token is None:
+        """Parse numbers, variables, arrays, reductions or parenthesized expressions."""
+        kind = self.current_kind()
+        if kind is None:
             raise SyntaxError("Unexpected end of input while parsing")
 
-        if token.type == TokenType.NUMBER:
+        if kind == NUMBER:
+            value = self.values[self.pos]
             self.consume()
-            return NumberNode(token.value)
+            return self.builder.number(value)
 
-        elif token.type == TokenType.ID:
+        elif kind == ID:
+            value = self.values[self.pos]
             self.consume()
-            return VarNode(token.value)
+            return self.builder.var(value)
+
+        elif kind == LBRACKET:  # Handle [expr, ...]
+            return self.array_literal()
 
-        elif token.type == TokenType.LPAREN:  # Handle (expr)
+        elif self.starts_reduction():  # Handle +/ factor
+            op = TOKEN_TYPES[kind]
+            self.consume()  # Consume the operator
+            self.consume()  # Consume '/'
+            return self.builder.reduce(op, self.factor())
+
+        elif kind == LPAREN:  # Handle (expr)
             self.consume()  # Consume '('
             expr = self.expression()  # Parse the inside expression
 
-            if self.current_token() and self.current_token().type == TokenType.RPAREN:
+            if self.current_kind() == RPAREN:
                 self.consume()  # Consume ')'
                 return expr
             else:
                 raise SyntaxError("Expected ')' after expression")
 
         else:
-            raise SyntaxError(f"Unexpected token: {token}")
\ No newline at end of file
+            raise SyntaxError(f"Unexpected token: {self.current_token()}")
+
+class PrecedenceParser(Parser):
+    """Parser whose expressions are parsed by operator precedence with explicit stacks.
+
+    Builds the same trees as Parser, but in one linear pass whose Python stack depth
+    does not grow with parenthesis nesting or expression length (only with the
+    nesting of array literals).
+    """
+    def expression(self):
+        """Parse an expression with the shunting-yard algorithm."""
+        kinds = self.kinds
+        values = self.values
+        length = self.length
+        builder = self.builder
+        precedence = BINARY_PRECEDENCE
+        operands = []
+        operators = [] # Binary operator kinds, and LPAREN for each open parenthesis
+        bindings = []  # Precedence of each entry in operators; -1 for LPAREN
+        open_parens = 0
+        pos = self.pos
+
+        def reduce(operator_kind):
+            if operator_kind >= REDUCTION_MARK:
+                operands[-1] = builder.reduce(TOKEN_TYPES[operator_kind - REDUCTION_MARK], operands[-1])
+            else:
+                right = operands.pop()
+                operands[-1] = builder.binop(operands[-1], TOKEN_TYPES[operator_kind], right)
+
+        while True:
+            # Operand position: any number of '(' and reduction prefixes, then a number,
+            # a variable or an array literal
+            while pos < length:
+                kind = kinds[pos]
+                if kind == LPAREN:
+                    operators.append(LPAREN)
+                    bindings.append(-1)
+                    open_parens += 1
+                    pos += 1
+                elif kind in REDUCTION_OPS and pos + 1 < length and kinds[pos + 1] == DIV:
+                    operators.append(kind + REDUCTION_MARK)
+                    bindings.append(REDUCTION_BINDING)
+                    pos += 2
+                else:
+                    break
+
+            kind = kinds[pos] if pos < length else None
+            if kind == NUMBER:
+                operands.append(builder.number(values[pos]))
+                pos += 1
+            elif kind == ID:
+                operands.append(builder.var(values[pos]))
+                pos += 1
+            elif kind == LBRACKET:
+                # Array elements are parsed by nested expression() calls, one level per bracket
+                self.pos = pos
+                operands.append(self.array_literal())
+                pos = self.pos
+            else:
+                self.pos = pos
+                if kind is None:
+                    raise SyntaxError("Unexpected end of input while parsing")
+                raise SyntaxError(f"Unexpected token: {self.current_token()}")
+
+            # Operator position: close any parentheses, then expect a binary operator
+            while True:
+                kind = kinds[pos] if pos < length else None
+                if kind in precedence:
+                    # Reduce operators that bind at least as tightly (strictly tighter when
+                    # the incoming operator is right-associative)
+                    threshold = precedence[kind] + (kind in RIGHT_ASSOCIATIVE)
+                    while bindings and bindings[-1] >= threshold:
+                        bindings.pop()
+                        reduce(operators.pop())
+                    operators.append(kind)
+                    bindings.append(precedence[kind])
+                    pos += 1
+                    break
+
+                if kind == RPAREN and open_parens:
+                    while bindings.pop() >= 0:
+                        reduce(operators.pop())
+                    operators.pop()
+                    open_parens -= 1
+                    pos += 1
+                    continue
+
+                # Anything else ends the expression
+                self.pos = pos
+                if open_parens:
+                    raise SyntaxError("Expected ')' after expression")
+                while operators:
+                    reduce(operators.pop())
+                return operands[0]
+
+def parse_program(tokens, builder=None):
+    """Parses with the recursive Parser, which is faster on ordinary programs, and
+    again with PrecedenceParser if an expression nests too deeply for Python's
+    recursion limit."""
+    try:
+        return Parser(tokens, builder).parse()
+    except RecursionError:
+        return PrecedenceParser(tokens, builder).parse()
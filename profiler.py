@@ -0,0 +1,124 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+from ast_nodes import *
+from interpreter import Interpreter, SlotInterpreter
+
+class Profile:
+    """Timings and counters collected while a program is processed.
+
+    - phases: wall time per pipeline phase (lex, parse, run, ...)
+    - nodes: per AST node type, how often execute/evaluate ran on it, the total
+      time including its children, and its self time excluding them
+    - operators: per binary or reduction operator, count and self time
+
+    Hooks are callables hook(event, detail, seconds) for an external tracer. Events
+    are "phase" (detail is the phase name), "enter" (detail is the node, seconds is
+    None) and "exit" (detail is the node, seconds is its total time).
+    """
+    def __init__(self):
+        self.phases = {}
+        self.nodes = {}
+        self.operators = {}
+        self.hooks = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            for hook in self.hooks:
+                hook("phase", name, elapsed)
+
+    def record_node(self, name, total, self_time):
+        stats = self.nodes.get(name)
+        if stats is None:
+            stats = self.nodes[name] = {"count": 0, "total": 0.0, "self": 0.0}
+        stats["count"] += 1
+        stats["total"] += total
+        stats["self"] += self_time
+
+    def record_operator(self, name, self_time):
+        stats = self.operators.get(name)
+        if stats is None:
+            stats = self.operators[name] = {"count": 0, "self": 0.0}
+        stats["count"] += 1
+        stats["self"] += self_time
+
+    def to_dict(self):
+        return {"phases": self.phases, "nodes": self.nodes, "operators": self.operators}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def report(self):
+        """Returns a readable summary, slowest entries first."""
+        lines = ["phase             seconds"]
+        for name, seconds in self.phases.items():
+            lines.append(f"{name:<14}{seconds:11.6f}")
+        lines.append("")
+        lines.append("node              count       total        self")
+        for name, stats in sorted(self.nodes.items(), key=lambda item: -item[1]["self"]):
+            lines.append(f"{name:<14}{stats['count']:9}{stats['total']:12.6f}{stats['self']:12.6f}")
+        if self.operators:
+            lines.append("")
+            lines.append("operator          count        self")
+            for name, stats in sorted(self.operators.items(), key=lambda item: -item[1]["self"]):
+                lines.append(f"{name:<14}{stats['count']:9}{stats['self']:12.6f}")
+        return "\n".join(lines)
+
+def phase(profile, name):
+    """profile.phase(name), or a no-op context when profiling is off."""
+    return nullcontext() if profile is None else profile.phase(name)
+
+class ProfilingInterpreter(Interpreter):
+    """Interpreter that records every execute/evaluate call into a Profile.
+
+    The plain Interpreter is untouched, so programs run without profiling pay
+    nothing for it. Constructor arguments other than `profile` go to the base
+    class.
+    """
+    def __init__(self, *args, profile=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile if profile is not None else Profile()
+        self.child_times = [0.0] # Time spent in the children of each active call
+
+    def execute(self, node):
+        self.timed(super().execute, node)
+
+    def evaluate(self, node):
+        return self.timed(super().evaluate, node)
+
+    def timed(self, method, node):
+        profile = self.profile
+        hooks = profile.hooks
+        for hook in hooks:
+            hook("enter", node, None)
+
+        child_times = self.child_times
+        child_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            return method(node)
+        finally:
+            elapsed = time.perf_counter() - start
+            self_time = elapsed - child_times.pop()
+            child_times[-1] += elapsed
+            profile.record_node(type(node).__name__, elapsed, self_time)
+            if isinstance(node, BinOpNode):
+                profile.record_operator(str(node.op), self_time)
+            elif isinstance(node, ReduceNode):
+                profile.record_operator(f"{node.op}/", self_time)
+            for hook in hooks:
+                hook("exit", node, elapsed)
+
+class ProfilingSlotInterpreter(ProfilingInterpreter, SlotInterpreter):
+    """ProfilingInterpreter for resolved programs; takes SlotInterpreter's arguments."""
+    pass
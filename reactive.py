@@ -0,0 +1,159 @@
+import heapq
+import sys
+from bisect import bisect_left
+
+from ast_nodes import *
+from interpreter import Interpreter
+
+def variables_read(node):
+    """Names of the variables an expression reads, in first-read order."""
+    names = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, VarNode):
+            if node.name not in names:
+                names.append(node.name)
+        elif isinstance(node, BinOpNode):
+            pending.append(node.right)
+            pending.append(node.left)
+        elif isinstance(node, ArrayNode):
+            pending.extend(reversed(node.elements))
+        elif isinstance(node, ReduceNode):
+            pending.append(node.operand)
+    return names
+
+class ReactiveInterpreter(Interpreter):
+    """Interpreter that remembers which binding every statement read, so a binding
+    can be redefined without running the whole program again.
+
+    Every executed statement is kept with its cached value and, for each variable it
+    reads, the statement whose assignment it read (its reaching definition).
+    redefine() replaces a binding. It then re-evaluates only the statements that
+    depend on that binding, directly or through other re-evaluated bindings, in
+    program order. Prints among them print again. Every other value comes from the
+    cache.
+    """
+    def __init__(self, output=None):
+        super().__init__(output)
+        self.program = []     # Executed statements in order
+        self.reads = []       # Statement index -> [(name, index of the assignment it read)]
+        self.values = []      # Statement index -> cached value of an assignment, None for prints
+        self.dependents = []  # Statement index -> indices of the statements reading its value
+        self.definitions = {} # Variable name -> ascending indices of the assignments to it
+        self.base = {}        # Variables inherited from a snapshot, read where no assignment reaches
+        self.recomputed = 0   # Statements re-evaluated by redefine()
+        self.skipped = 0      # Statements a full re-run would have executed but redefine() did not
+
+    def execute(self, node):
+        expr = node.expr if isinstance(node, (AssignNode, PrintNode)) else None
+        reads = [] if expr is None else [(name, self.reaching(name, len(self.program))) for name in variables_read(expr)]
+        super().execute(node) # Reports undefined variables and other errors as usual
+
+        index = len(self.program)
+        self.program.append(node)
+        self.reads.append(reads)
+        self.dependents.append([])
+        for _, definition in reads:
+            if definition is not None: # Read from the snapshot the interpreter started from
+                self.dependents[definition].append(index)
+        if isinstance(node, AssignNode):
+            self.values.append(self.variables[node.var])
+            self.definitions.setdefault(node.var, []).append(index)
+        else:
+            self.values.append(None)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, output=None):
+        interpreter = super().from_snapshot(snapshot, output)
+        interpreter.base = snapshot # Frozen, so it keeps the values the statements read
+        return interpreter
+
+    def reaching(self, name, index):
+        """Index of the last assignment to `name` before statement `index`, or None."""
+        definitions = self.definitions.get(name)
+        if not definitions:
+            return None
+        position = bisect_left(definitions, index)
+        return definitions[position - 1] if position else None
+
+    def evaluate_with(self, expr, reads, values):
+        """Evaluates an expression with each variable bound to the value of the
+        assignment it reads; `values` overrides the cache for updated statements.
+        A variable no assignment reaches is read from the snapshot, if any."""
+        saved = self.variables
+        self.variables = {}
+        for name, definition in reads:
+            if definition is not None:
+                self.variables[name] = values[definition] if definition in values else self.values[definition]
+            elif name in self.base:
+                self.variables[name] = self.base[name]
+        try:
+            return self.evaluate(expr)
+        finally:
+            self.variables = saved
+
+    def redefine(self, node):
+        """Replaces the latest assignment to node.var with `node` and re-evaluates
+        everything that depends on it. The new expression reads the latest binding
+        of every variable, as the plain Interpreter would. If one of them comes after
+        the replaced assignment, including the variable itself (let a = a + 1;), or
+        the variable has no assignment yet, `node` is executed as a new statement
+        instead. Returns the number of statements evaluated.
+
+        Nothing changes if an evaluation fails: the error is printed to the output and
+        sys.exit(1) is called, as the Interpreter does, and the cache keeps the old
+        values. Python exceptions such as ZeroDivisionError are reported the same way.
+        """
+        definitions = self.definitions.get(node.var)
+        if not definitions:
+            self.execute(node)
+            return 1
+        index = definitions[-1]
+        reads = [(name, self.reaching(name, len(self.program))) for name in variables_read(node.expr)]
+        if any(definition is not None and definition >= index for _, definition in reads):
+            self.execute(node) # Bound later, so it cannot be evaluated in the replaced statement's place
+            return 1
+
+        # Evaluate every affected statement first, in program order, and only then
+        # store the results, so a failing evaluation leaves the cache consistent
+        try:
+            values = {index: self.evaluate_with(node.expr, reads, {})}
+            printed = []
+            pending = list(self.dependents[index])
+            heapq.heapify(pending)
+            while pending:
+                current = heapq.heappop(pending)
+                if current in values:
+                    continue
+                statement = self.program[current]
+                value = self.evaluate_with(statement.expr, self.reads[current], values)
+                values[current] = value
+                if isinstance(statement, AssignNode):
+                    for dependent in self.dependents[current]:
+                        heapq.heappush(pending, dependent)
+                else:
+                    printed.append(value)
+        except Exception as e: # e.g. a dependent now divides by zero
+            print(f"Error: {type(e).__name__}: {e}", file=self.output)
+            sys.exit(1)
+
+        for _, definition in self.reads[index]:
+            if definition is not None:
+                self.dependents[definition].remove(index)
+        for _, definition in reads:
+            if definition is not None:
+                self.dependents[definition].append(index)
+        self.program[index] = node
+        self.reads[index] = reads
+        for current, value in values.items():
+            if isinstance(self.program[current], AssignNode):
+                self.values[current] = value
+                if self.definitions[self.program[current].var][-1] == current:
+                    self.variables[self.program[current].var] = value
+        for value in printed:
+            print(value, file=self.output)
+
+        self.recomputed += len(values)
+        self.skipped += len(self.program) - len(values)
+        return len(values)
@@ -0,0 +1,88 @@
+from tokens import TokenType
+from lexer import Lexer
+from parser import parse_program
+from interpreter import Interpreter
+from reactive import ReactiveInterpreter
+from ast_nodes import AssignNode
+from optimizer import Optimizer
+
+SEMICOLON, COMMENT = TokenType.SEMICOLON, TokenType.COMMENT
+
+class Session:
+    """A long-lived interactive session.
+
+    Each submitted statement is lexed, parsed and run on its own against one
+    Interpreter, so variables persist across lines and the work per line depends
+    only on that line. Lines are buffered until the text ends with ';', which lets
+    a statement span several lines. Errors are reported and the session continues.
+
+    With reactive=True, a `let` for a variable that is already bound redefines that
+    binding instead: every earlier statement that depends on it is re-evaluated,
+    like a spreadsheet cell, and prints among them print again. A `let` that reads
+    its own variable or one bound after it, such as `let a = a + 1;`, is a new
+    binding as usual.
+    """
+    def __init__(self, optimize=False, output=None, reactive=False):
+        self.interpreter = ReactiveInterpreter(output) if reactive else Interpreter(output)
+        self.reactive = reactive
+        self.optimizer = Optimizer() if optimize else None # Keeps its known constants across lines
+        self.output = output
+        self.pending = [] # Lines of a statement that is not terminated yet
+
+    @property
+    def variables(self):
+        return self.interpreter.variables
+
+    def feed(self, line):
+        """Adds a line of input and runs it once it completes a statement.
+
+        Returns False while more input is needed to finish the statement, True otherwise.
+        """
+        self.pending.append(line)
+        try:
+            tokens = Lexer("\n".join(self.pending)).tokenize_buffer()
+            kinds = [kind for kind in tokens.kinds if kind != COMMENT]
+            if kinds and kinds[-1] != SEMICOLON:
+                return False
+            statements = parse_program(tokens)
+        except SyntaxError as e:
+            print(f"Syntax Error: {e}", file=self.output)
+            statements = []
+        self.pending = []
+
+        for statement in statements:
+            if self.optimizer is not None:
+                statement = self.optimizer.optimize_statement(statement)
+            try:
+                if self.reactive and isinstance(statement, AssignNode) and statement.var in self.variables:
+                    self.interpreter.redefine(statement)
+                else:
+                    self.interpreter.execute(statement)
+            except SystemExit: # The Interpreter has already printed the error
+                break
+            except Exception as e: # e.g. ZeroDivisionError from the program itself
+                print(f"Error: {type(e).__name__}: {e}", file=self.output)
+                break
+        return True
+
+    def reset(self):
+        """Drops a partially typed statement."""
+        self.pending = []
+
+def interact(optimize=False, reactive=False):
+    """Reads statements at the prompt until 'end' or end of input."""
+    session = Session(optimize, reactive=reactive)
+    print("Enter statements ending with ';' (type 'end' to finish):")
+    while True:
+        try:
+            line = input("...> " if session.pending else "input> ")
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            print()
+            session.reset()
+            continue
+        if line.strip().lower() == "end":
+            break
+        session.feed(line)
+    return session
@@ -0,0 +1,58 @@
+from ast_nodes import *
+
+class ResolveError(Exception):
+    """Raised when a variable is read before any statement assigns it."""
+    pass
+
+class Resolver:
+    """Numbers every variable before execution.
+
+    Each distinct variable name gets a slot index, stored on its AssignNodes and
+    VarNodes so SlotInterpreter can keep values in a list instead of a dict. Because
+    programs are a flat list of statements, a read of a variable that no earlier
+    statement assigns is found here rather than at run time.
+    """
+    def __init__(self):
+        self.slots = {} # Variable name -> slot index
+        self.names = [] # Slot index -> variable name
+
+    def resolve(self, nodes):
+        for node in nodes:
+            if isinstance(node, list): # Flatten nested statements the same way Interpreter.interpret does
+                for sub_node in node:
+                    self.resolve_statement(sub_node)
+            else:
+                self.resolve_statement(node)
+        return self.names
+
+    def resolve_statement(self, node):
+        if isinstance(node, AssignNode):
+            # The right-hand side is resolved first: in 'let x = x + 1;' the x read must already exist
+            self.resolve_expression(node.expr)
+            if node.var not in self.slots:
+                self.slots[node.var] = len(self.names)
+                self.names.append(node.var)
+            node.slot = self.slots[node.var]
+
+        elif isinstance(node, PrintNode):
+            self.resolve_expression(node.expr)
+
+    def resolve_expression(self, node):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, VarNode):
+                if node.name not in self.slots:
+                    raise ResolveError(f"Variable '{node.name}' is not defined.")
+                node.slot = self.slots[node.name]
+            elif isinstance(node, BinOpNode):
+                pending.append(node.right)
+                pending.append(node.left)
+            elif isinstance(node, ArrayNode):
+                pending.extend(reversed(node.elements))
+            elif isinstance(node, ReduceNode):
+                pending.append(node.operand)
+
+def resolve(nodes):
+    """Assigns variable slots in place and returns the slot names, in slot order."""
+    return Resolver().resolve(nodes)
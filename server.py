@@ -0,0 +1,316 @@
+import asyncio
+import ipaddress
+import json
+import math
+import os
+import signal
+import stat
+import sys
+import time
+
+from lexer import Lexer
+from parser import parse_program
+from interpreter import Interpreter, SlotInterpreter
+from optimizer import Optimizer, DeadCodeEliminator
+from resolver import Resolver, ResolveError
+
+def tcp_address(address):
+    """(host, port) for 'HOST:PORT' or 'PORT', with host 127.0.0.1 by default, or
+    None for a Unix socket path. Programs run unauthenticated, so HOST must be
+    localhost or a loopback address; anything else raises ValueError."""
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        return None
+    host = host.strip("[]") or "127.0.0.1"
+    if host != "localhost":
+        try:
+            loopback = ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"{host} is not a loopback address; the server only listens on localhost")
+    return host, int(port)
+
+# Script run by the worker processes
+WORKER = os.path.abspath(__file__)
+
+class RequestTimeout(Exception):
+    pass
+
+class WorkerError(Exception):
+    pass
+
+class StreamedOutput:
+    """Text stream handed to the Interpreter in a worker process.
+
+    Output is collected in memory and sent to the server by flush(). The last
+    line is always held back, because an Interpreter error is printed as the final
+    line just before sys.exit(1) and must become the response's error instead.
+    """
+    def __init__(self, send, limit=1 << 14):
+        self.send = send # Called with a block of complete lines
+        self.limit = limit
+        self.chunks = []
+        self.size = 0
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.size >= self.limit:
+            self.flush()
+        return len(text)
+
+    def flush(self, everything=False):
+        """Sends everything before the last line, or all of it between statements,
+        when no error line can follow."""
+        if not self.chunks:
+            return
+        text = "".join(self.chunks)
+        cut = len(text) if everything else text.rfind("\n", 0, len(text) - 1) + 1 # Start of the last line
+        if cut:
+            self.send(text[:cut])
+            text = text[cut:]
+        self.chunks = [text]
+        self.size = len(text)
+
+    def rest(self):
+        """Returns the text that has not been sent."""
+        text = "".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return text
+
+def evaluate(source, output, deadline, optimize=False, resolve=False, send_interval=0.05):
+    """Lexes, parses and runs one program in a fresh Interpreter.
+
+    Runs in a worker process. Returns (unsent output, error or None). The deadline
+    is checked between statements, which stops most long programs cheaply. A
+    single statement can still run for long (e.g. big integer products), so the
+    server also kills the worker at the deadline. Output is flushed to the client
+    every `send_interval` seconds, so a killed program loses at most that much.
+    """
+    try:
+        ast = parse_program(Lexer(source).tokenize_buffer())
+        if optimize:
+            ast = DeadCodeEliminator().eliminate(Optimizer().optimize(ast))
+        if resolve:
+            interpreter = SlotInterpreter(Resolver().resolve(ast), output)
+        else:
+            interpreter = Interpreter(output)
+
+        next_send = time.monotonic() + send_interval
+        for node in ast:
+            for statement in node if isinstance(node, list) else (node,):
+                now = time.monotonic()
+                if now > deadline:
+                    raise RequestTimeout
+                if now > next_send:
+                    output.flush(everything=True)
+                    next_send = now + send_interval
+                interpreter.execute(statement)
+    except SyntaxError as e:
+        return output.rest(), f"Syntax Error: {e}"
+    except ResolveError as e:
+        return output.rest(), f"Error: {e}"
+    except RequestTimeout:
+        return output.rest(), "Error: Time limit exceeded."
+    except SystemExit: # The Interpreter printed the error as the last line
+        text, _, error = output.rest().rstrip("\n").rpartition("\n")
+        return text + "\n" if text else "", error
+    except Exception as e: # e.g. ZeroDivisionError or RecursionError from the program itself
+        return output.rest(), f"Error: {type(e).__name__}: {e}"
+    return output.rest(), None
+
+class EvaluationServer:
+    """Evaluates programs sent as JSON lines over a Unix socket or localhost TCP.
+
+    Every request is one line such as {"id": 1, "source": "print(1);"} with optional
+    "optimize", "resolve" and "timeout" (seconds, at most the server's) fields. The
+    server answers with {"id": 1, "output": "..."} lines as output is produced, then
+    {"id": 1, "status": 0, "error": null, "time": seconds}. Requests on one
+    connection run concurrently and are matched to their answers by id.
+
+    Programs run in worker processes, one program at a time each and with a fresh
+    Interpreter, so no variables leak between requests. Errors, including the
+    Interpreter's sys.exit(1), only end their own request. A program still running
+    at its deadline is answered with a time limit error and its worker is killed
+    and replaced later, since a single statement cannot be interrupted otherwise.
+    At most `max_concurrent` programs run at once; the rest wait in order.
+    """
+    def __init__(self, max_concurrent=None, timeout=10.0, max_request=1 << 20):
+        if not math.isfinite(timeout) or timeout <= 0:
+            raise ValueError(f"timeout must be a positive number of seconds, not {timeout}")
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_request = max_request # Longest request line in bytes
+        self.slots = asyncio.Semaphore(self.max_concurrent)
+        self.idle = [] # Worker processes waiting for a program
+        self.requests = 0
+
+    async def start(self, address):
+        """Listens on `address`: 'HOST:PORT' or 'PORT' for TCP (host defaults to
+        127.0.0.1), anything else is a Unix socket path."""
+        tcp = tcp_address(address)
+        if tcp is not None:
+            return await asyncio.start_server(self.handle, *tcp, limit=self.max_request)
+        if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+            os.unlink(address) # A stale socket left by an earlier server
+        return await asyncio.start_unix_server(self.handle, address, limit=self.max_request)
+
+    async def handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # Longer than max_request; the rest of the stream cannot be framed
+                    self.reply(writer, {"id": None, "status": 1, "error": "Error: Request too large."})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def answer(self, line, writer):
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            source = request["source"]
+            if not isinstance(source, str):
+                raise TypeError("'source' must be a string")
+            timeout = float(request.get("timeout", self.timeout))
+            if not math.isfinite(timeout) or timeout <= 0: # NaN would never expire
+                raise ValueError("'timeout' must be a positive number of seconds")
+            timeout = min(timeout, self.timeout)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.reply(writer, {"id": None, "status": 1, "error": f"Error: Bad request: {e}"})
+            return
+
+        job = {"source": source, "timeout": timeout,
+               "optimize": bool(request.get("optimize")), "resolve": bool(request.get("resolve"))}
+        async with self.slots:
+            worker = self.idle.pop() if self.idle else await self.spawn()
+            start = time.monotonic()
+            try:
+                error = await asyncio.wait_for(self.run(worker, job, request_id, writer), timeout)
+                self.idle.append(worker)
+                worker = None
+            except asyncio.TimeoutError:
+                error = "Error: Time limit exceeded."
+            except WorkerError as e:
+                error = f"Error: {e}"
+            finally:
+                if worker is not None: # Stopped mid-program, or broken; it cannot be reused
+                    worker.kill()
+            elapsed = time.monotonic() - start
+        self.requests += 1
+
+        self.reply(writer, {"id": request_id, "status": 0 if error is None else 1, "error": error,
+                            "time": round(elapsed, 6)})
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def spawn(self):
+        return await asyncio.create_subprocess_exec(
+            sys.executable, WORKER, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            limit=self.max_request * 16)
+
+    async def run(self, worker, job, request_id, writer):
+        """Sends a program to a worker and forwards its output; returns the error or None."""
+        try:
+            worker.stdin.write(json.dumps(job).encode() + b"\n")
+            await worker.stdin.drain()
+            while True:
+                line = await worker.stdout.readline()
+                if not line:
+                    raise WorkerError("Evaluation failed: the worker process exited.")
+                message = json.loads(line)
+                if "output" not in message:
+                    return message["error"]
+                self.reply(writer, {"id": request_id, "output": message["output"]})
+        except (ConnectionError, ValueError) as e: # A broken pipe, or an output line too long to frame
+            raise WorkerError(f"Evaluation failed: {e}")
+
+    async def close(self):
+        """Stops the idle worker processes."""
+        workers, self.idle = self.idle, []
+        for worker in workers:
+            worker.kill()
+            await worker.wait()
+
+    def reply(self, writer, message):
+        if not writer.is_closing():
+            writer.write(json.dumps(message).encode() + b"\n")
+
+async def serve(address, max_concurrent=None, timeout=10.0):
+    """Runs an EvaluationServer on `address` until cancelled or sent SIGTERM."""
+    evaluator = EvaluationServer(max_concurrent, timeout)
+    server = await evaluator.start(address)
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        async with server:
+            print(f"Serving on {address}", flush=True)
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await evaluator.close()
+        if tcp_address(address) is None:
+            os.unlink(address)
+
+async def request(address, source, **options):
+    """Sends one program to a server and returns (output, error)."""
+    tcp = tcp_address(address)
+    if tcp is not None:
+        reader, writer = await asyncio.open_connection(*tcp, limit=1 << 20)
+    else:
+        reader, writer = await asyncio.open_unix_connection(address, limit=1 << 20)
+    try:
+        writer.write(json.dumps(dict(options, id=0, source=source)).encode() + b"\n")
+        await writer.drain()
+        chunks = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            message = json.loads(line)
+            if "output" in message:
+                chunks.append(message["output"])
+            else:
+                return "".join(chunks), message["error"]
+    finally:
+        writer.close()
+
+def work():
+    """Main loop of a worker process: evaluates the programs sent as JSON lines on
+    stdin one at a time and answers each with output lines and a final error line."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # The server stops its workers itself
+    protocol = sys.stdout
+    sys.stdout = sys.stderr # Stray prints must not corrupt the protocol
+    def send(message):
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        output = StreamedOutput(lambda text: send({"output": text}))
+        rest, error = evaluate(job["source"], output, time.monotonic() + job["timeout"],
+                               job["optimize"], job["resolve"])
+        if rest:
+            send({"output": rest})
+        send({"error": error})
+
+if __name__ == "__main__":
+    work()
@@ -0,0 +1,47 @@
+from tokens import TokenType
+from lexer import Lexer, TokenBuffer
+from parser import parse_program
+
+SEMICOLON = int(TokenType.SEMICOLON)
+
+def statement_chunks(lines, batch=256):
+    """Lexes an iterable of source lines and yields TokenBuffers of whole statements.
+
+    Lines are lexed `batch` at a time and appended to the current chunk. Everything
+    up to the chunk's last ';' is yielded, and the tokens after it start the next
+    chunk, so statements may span batches. Memory is bounded by `batch` lines plus
+    the largest statement, since tokens of earlier chunks are not kept. Whatever is
+    left at the end of input is yielded too, so an unterminated statement is still
+    reported by the parser.
+    """
+    chunk = TokenBuffer()
+    pending = []
+    for line in lines:
+        pending.append(line.rstrip("\n"))
+        if len(pending) < batch:
+            continue
+        start = len(chunk) # The tokens carried over hold no ';'
+        Lexer("\n".join(pending)).tokenize_buffer(chunk)
+        pending = []
+        kinds = chunk.kinds
+        end = len(kinds)
+        while end > start and kinds[end - 1] != SEMICOLON:
+            end -= 1
+        if end > start:
+            yield chunk.split(end)
+    if pending:
+        Lexer("\n".join(pending)).tokenize_buffer(chunk)
+    if len(chunk):
+        yield chunk
+
+def parse_stream(lines, optimizer=None):
+    """Yields the statements of a program one at a time as its lines are read.
+
+    Interpreter.interpret accepts this generator directly, so each statement runs
+    before the next line is read and a syntax error only surfaces once the
+    statements before it have run. With an Optimizer, statements are folded one at
+    a time; dead-assignment removal needs the whole program and is skipped.
+    """
+    for chunk in statement_chunks(lines):
+        for statement in parse_program(chunk):
+            yield statement if optimizer is None else optimizer.optimize_statement(statement)
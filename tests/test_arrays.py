@@ -0,0 +1,49 @@
+import io
+import warnings
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from vm import VM
+from codegen import NativeInterpreter
+
+ENGINES = [Interpreter, VM, NativeInterpreter]
+
+def run(engine, source):
+    output = io.StringIO()
+    engine(output).interpret(Parser(Lexer(source).tokenize_buffer()).parse())
+    return output.getvalue()
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("source", ["print([1, 2] / [0, 1]);", "print([1.5, 2] / 0);", "print(4 / [2, 0.0]);"])
+def test_division_by_a_zero_element_raises(engine, source):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # NumPy must not get to divide by zero
+        with pytest.raises(ZeroDivisionError):
+            run(engine, source)
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_integer_division_truncates_element_wise(engine):
+    assert run(engine, "print([7, 9] / [2, 4]); print([7, 4] / 2.0);") == "[3 2]\n[3.5 2. ]\n"
+
+def outcome(engine, source):
+    output = io.StringIO()
+    try:
+        engine(output).interpret(Parser(Lexer(source).tokenize_buffer()).parse())
+    except SystemExit:
+        return output.getvalue(), "exit"
+    return output.getvalue(), None
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("source, error", [
+    ("print(1); print([[1, 2], [3]]);", "Error: Array elements must all have the same shape."),
+    ("print(1); print([1, 2] + [1, 2, 3]);", "Error: Array shapes (2,) and (3,) do not match."),
+    ("let a = [1, 2]; let b = [[1, 2, 3]]; print(1); print(a * b);", "Error: Array shapes (2,) and (1, 3) do not match."),
+    ("print(1); print([1, 2] / [1, 2, 3]);", "Error: Array shapes (2,) and (3,) do not match."),
+])
+def test_shape_errors_are_reported_like_other_errors(engine, source, error):
+    assert outcome(engine, source) == (f"1\n{error}\n", "exit")
@@ -0,0 +1,43 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from output import BufferedOutput
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("options", [[], ["--stream"]])
+def test_unreadable_file_is_reported_and_the_others_run(tmp_path, options):
+    missing, program = tmp_path / "missing.txt", tmp_path / "ok.txt"
+    program.write_text("print(1);\n")
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *options, str(missing), str(program)],
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stdout == "1\n"
+    assert result.stderr.startswith(f"{missing}: Error: [Errno 2] No such file or directory")
+
+@pytest.mark.parametrize("options", [[], ["--stream"], ["-j", "1"], ["--engine", "vm"], ["--engine", "native"]])
+def test_runtime_errors_are_reported_per_file(tmp_path, options):
+    undefined, division, program = tmp_path / "u.apl", tmp_path / "t.apl", tmp_path / "ok.apl"
+    undefined.write_text("print(1);\nprint(x);\n")
+    division.write_text("print(2);\nprint(1 / 0);\n")
+    program.write_text("print(3);\n")
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *options, str(undefined), str(division),
+                             str(program)], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stdout == "1\n2\n3\n"
+    assert result.stderr == (f"{undefined}: Error: Variable 'x' is not defined.\n"
+                             f"{division}: Error: ZeroDivisionError: division by zero\n")
+
+def test_error_line_is_held_back_past_the_buffer_limit():
+    stream = io.StringIO()
+    output = BufferedOutput(stream, limit=8)
+    for value in range(10):
+        print(value, file=output)
+    print("Error: stop", file=output)
+    assert output.pop_line() == "Error: stop"
+    output.flush()
+    assert stream.getvalue() == "".join(f"{value}\n" for value in range(10))
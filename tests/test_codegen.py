@@ -0,0 +1,43 @@
+import io
+import random
+
+import pytest
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from codegen import MAX_NESTING, NativeInterpreter
+from benchmarks.bench_codegen import random_program
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def outcome(engine, source):
+    """Output and the way a run ended: None, 'exit' (a reported error) or an exception name."""
+    output = io.StringIO()
+    try:
+        engine(output).interpret(parse(source))
+        error = None
+    except SystemExit:
+        error = "exit"
+    except Exception as e:
+        error = type(e).__name__
+    return output.getvalue(), error
+
+def deep(expression, depth=MAX_NESTING + 20):
+    return "(" * depth + expression + " + 1)" * depth
+
+@pytest.mark.parametrize("source", [
+    f"print(q + {deep('1 / 0')});",
+    f"let a = 1; print(a + q + {deep('1 / 0')});",
+    f"print({deep('q')} + {deep('1 / 0')});",
+    f"let a = {deep('2')}; print(a + {deep('a * 3')});",
+])
+def test_deep_expressions_keep_left_to_right_evaluation(source):
+    assert outcome(NativeInterpreter, source) == outcome(Interpreter, source)
+
+def test_random_programs_match_the_interpreter():
+    rng = random.Random(0)
+    for _ in range(500):
+        source = random_program(rng)
+        assert outcome(NativeInterpreter, source) == outcome(Interpreter, source), source
@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, QuickeningInterpreter, SlotInterpreter
+from reactive import ReactiveInterpreter
+
+PREFIX = "let a = 2; let b = a * 3; let c = [1, 2, 3];"
+VARIANT = "let a = a + 1; let d = a + b; print(d); print(+/c * b);"
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def run(engine, source):
+    interpreter = engine(io.StringIO())
+    interpreter.interpret(parse(source))
+    return interpreter
+
+@pytest.mark.parametrize("engine", [Interpreter, QuickeningInterpreter, ReactiveInterpreter])
+def test_fork_matches_a_full_run(engine):
+    expected = run(engine, PREFIX + VARIANT)
+    snapshot = run(engine, PREFIX).snapshot()
+    for _ in range(2): # Forks share the snapshot without changing it
+        fork = engine.from_snapshot(snapshot, io.StringIO())
+        fork.interpret(parse(VARIANT))
+        assert fork.output.getvalue() == expected.output.getvalue()
+        assert {name: str(value) for name, value in fork.variables.items()} == \
+               {name: str(value) for name, value in expected.variables.items()}
+    assert snapshot["a"] == 2 and "d" not in snapshot
+
+def test_reactive_fork_redefines_on_top_of_the_snapshot():
+    fork = ReactiveInterpreter.from_snapshot(run(ReactiveInterpreter, PREFIX).snapshot(), io.StringIO())
+    fork.interpret(parse("let x = 1; let y = x + b; print(y);"))
+    fork.redefine(parse("let x = 10;")[0])
+    assert fork.output.getvalue() == "7\n16\n"
+    assert fork.variables["y"] == 16
+
+def test_slot_interpreter_cannot_fork():
+    with pytest.raises(TypeError):
+        SlotInterpreter.from_snapshot(run(Interpreter, PREFIX).snapshot())
@@ -0,0 +1,16 @@
+import pytest
+
+from lexer import Lexer
+from benchmarks.generators import let_chain
+
+def columns(buffer):
+    return list(buffer.kinds), buffer.values, list(buffer.line_ends)
+
+def test_parallel_lexing_matches_serial():
+    source = let_chain(2000)
+    assert columns(Lexer(source).tokenize_parallel(2, chunk_size=4096)) == columns(Lexer(source).tokenize_buffer())
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_parallel_lexing_needs_a_worker(workers):
+    with pytest.raises(ValueError):
+        Lexer(let_chain(2000)).tokenize_parallel(workers, chunk_size=4096)
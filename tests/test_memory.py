@@ -0,0 +1,74 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from memory import MemoryProfile, MemoryBudgetExceeded
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main(*args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *args],
+                          capture_output=True, text=True)
+
+def test_exceeded_budget_raises_once():
+    with MemoryProfile(budget=1 << 20, top=0) as profile:
+        blocks = [] # Kept until the phase ends, whether the watcher or the end of the phase notices
+        with pytest.raises(MemoryBudgetExceeded):
+            with profile.phase("grow"):
+                blocks.extend(bytes(1024) for _ in range(4096))
+        blocks.clear()
+        with profile.phase("next"): # Already reported
+            pass
+    assert profile.exceeded["phase"] == "grow"
+    assert [record["phase"] for record in profile.phases] == ["grow", "next"]
+
+def test_interrupt_between_phases_raises_in_the_next_phase():
+    with MemoryProfile(budget=1 << 30, top=0) as profile:
+        with profile.phase("lex"):
+            pass
+        profile.exceeded = {"phase": "lex", "traced": 1 << 31}
+        profile.interrupted(signal.SIGINT, None) # Arrives with no phase running
+        ran = False
+        with pytest.raises(MemoryBudgetExceeded, match="during lex"):
+            with profile.phase("parse"):
+                ran = True
+        assert not ran
+
+def test_real_interrupt_is_a_keyboard_interrupt():
+    with MemoryProfile(budget=1 << 30, top=0) as profile:
+        with pytest.raises(KeyboardInterrupt):
+            with profile.phase("run"):
+                profile.interrupted(signal.SIGINT, None)
+    assert profile.exceeded is None
+
+def test_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        MemoryProfile(budget=0)
+    result = main("--memory-budget", "0", os.path.join(ROOT, "README.md"))
+    assert result.returncode == 2
+    assert "--memory-budget must be a positive number" in result.stderr
+
+def test_batch_reports_exceeded_budget_once(tmp_path):
+    program = tmp_path / "big.txt"
+    program.write_text("".join(f"let a{i} = {i} + 1;\n" for i in range(20000)))
+    result = main("--memory", "-", "--memory-budget", "1", str(program))
+    assert result.returncode == 1
+    error, _, report = result.stderr.partition("\n")
+    assert error.startswith(f"{program}: Error: memory budget of 1048576 bytes exceeded during ")
+    report = json.loads(report)
+    assert report["exceeded"]["phase"] == report["phases"][-1]["phase"]
+
+def test_batch_reports_memory_once_after_a_runtime_error(tmp_path):
+    program = tmp_path / "error.txt"
+    program.write_text("print(1);\nprint(zz);\n")
+    result = main("--memory", "-", str(program))
+    assert result.returncode == 1
+    assert result.stdout == "1\n"
+    error, _, report = result.stderr.partition("\n")
+    assert error == f"{program}: Error: Variable 'zz' is not defined."
+    report = json.loads(report)
+    assert [record["phase"] for record in report["phases"]] == ["read", "lex", "parse", "run"]
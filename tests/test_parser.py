@@ -0,0 +1,52 @@
+import io
+import random
+
+import pytest
+
+from lexer import Lexer
+from parser import Parser, PrecedenceParser, parse_program
+from interpreter import Interpreter
+from vm import VM
+from benchmarks.bench_codegen import random_program
+from benchmarks.generators import WORKLOADS
+
+def tokens(source):
+    return Lexer(source).tokenize_buffer()
+
+def outcome(parser, source):
+    try:
+        return repr(parser(tokens(source)).parse())
+    except SyntaxError as e:
+        return f"SyntaxError: {e}"
+
+def test_same_trees_as_the_recursive_parser():
+    rng = random.Random(1)
+    sources = [random_program(rng) for _ in range(500)]
+    sources += [generate(**dict(options, statements=200)) for generate, options in WORKLOADS.values()]
+    sources += ["print(+/ [1, 2] * 2 - (3 - 4) / 5);", "let a = -/ */ [[1, 2], [3, 4]];"]
+    for source in sources:
+        assert outcome(PrecedenceParser, source) == outcome(Parser, source), source
+
+@pytest.mark.parametrize("source", ["print(1 + );", "print((1 + 2);", "let = 3;", "print(1 2);", "print([1, 2);",
+                                    "print(1", "let a = (((1)));)"])
+def test_same_syntax_errors_as_the_recursive_parser(source):
+    assert outcome(PrecedenceParser, source) == outcome(Parser, source)
+
+def run(engine, ast):
+    output = io.StringIO()
+    engine(output).interpret(ast)
+    return output.getvalue()
+
+def test_deep_parentheses():
+    source = "print(" + "(" * 20000 + "1 + 1" + ")" * 20000 + ");"
+    with pytest.raises(RecursionError):
+        Parser(tokens(source)).parse()
+    ast = parse_program(tokens(source)) # Falls back to PrecedenceParser
+    assert repr(ast) == repr(Parser(tokens("print(1 + 1);")).parse())
+    assert run(Interpreter, ast) == "2\n"
+
+def test_deep_trees():
+    depth = 10000
+    source = "print(" + "1 + (" * depth + "1" + ")" * depth + ");"
+    ast = parse_program(tokens(source))
+    assert run(VM, ast) == f"{depth + 1}\n" # The VM compiles and runs deep trees without recursion
@@ -0,0 +1,34 @@
+import io
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, QuickeningInterpreter
+from benchmarks.generators import WORKLOADS
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def run(interpreter, ast, variables=None):
+    interpreter.variables = dict(variables or {})
+    interpreter.interpret(ast)
+    return interpreter.output.getvalue()
+
+def test_repeated_runs_match_the_interpreter():
+    for name, (generate, options) in WORKLOADS.items():
+        ast = parse(generate(**dict(options, statements=200)))
+        expected = run(Interpreter(io.StringIO()), ast)
+        sites = {}
+        for _ in range(4):
+            assert run(QuickeningInterpreter(io.StringIO(), sites), ast) == expected, name
+        assert sites and all(site.hits == 2 for site in sites.values())
+
+def test_type_change_deoptimizes_and_respecializes():
+    ast = parse("let b = a * 2; print(b / 3);")
+    sites = {}
+    for value in (1, 1, 1, 1.5, 1.5, 1.5):
+        output = run(QuickeningInterpreter(io.StringIO(), sites), ast, {"a": value})
+        assert output == run(Interpreter(io.StringIO()), ast, {"a": value})
+    stats = QuickeningInterpreter(sites=sites).site_stats(ast)
+    assert [(site["specialized"], site["hits"], site["misses"], site["deopts"]) for site in stats] == \
+           [("MUL(float, int)", 2, 2, 1), ("DIV(float, int)", 2, 2, 1)]
+    assert not hasattr(ast[0].expr, "site")
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from lexer import Lexer
+from parser import Parser
+from repl import Session
+from reactive import ReactiveInterpreter
+
+def parse(source):
+    return Parser(Lexer(source).tokenize_buffer()).parse()
+
+def run(source):
+    interpreter = ReactiveInterpreter(io.StringIO())
+    interpreter.interpret(parse(source))
+    interpreter.output = io.StringIO()
+    return interpreter
+
+def test_redefinition_updates_dependents_only():
+    interpreter = run("let a = 2; let b = a * 3; let c = 7; print(b + c); let d = c + 1;")
+    assert interpreter.redefine(parse("let a = 10;")[0]) == 3 # a, b and the print
+    assert interpreter.output.getvalue() == "37\n"
+    assert interpreter.variables == {"a": 10, "b": 30, "c": 7, "d": 8}
+    assert interpreter.skipped == 2
+
+def test_redefinition_matches_a_full_run():
+    source = "let a = 1; let b = a + 1; let a = 5; let c = a * b; print(c);"
+    interpreter = run(source)
+    interpreter.redefine(parse("let a = 7;")[0]) # Replaces the latest binding of a
+    assert interpreter.variables == run(source.replace("let a = 5;", "let a = 7;")).variables
+
+def test_self_referencing_let_is_a_new_binding():
+    interpreter = run("let a = 1; let b = a * 10;")
+    interpreter.redefine(parse("let a = a + 1;")[0])
+    assert interpreter.variables == {"a": 2, "b": 10}
+    assert len(interpreter.program) == 3
+
+def test_reactive_session_matches_plain_session_for_self_reference():
+    for reactive in (False, True):
+        session = Session(output=io.StringIO(), reactive=reactive)
+        for line in ("let a = 1;", "let a = a + 1;", "print(a);"):
+            session.feed(line)
+        assert session.output.getvalue() == "2\n"
+
+def test_failing_dependent_is_reported_and_cache_is_kept():
+    interpreter = run("let a = 1; let b = 5 / a; print(b);")
+    values, variables = list(interpreter.values), dict(interpreter.variables)
+    try:
+        interpreter.redefine(parse("let a = 0;")[0])
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError("redefine() should stop with SystemExit")
+    assert interpreter.output.getvalue() == "Error: ZeroDivisionError: division by zero\n"
+    assert interpreter.values == values
+    assert interpreter.variables == variables
+    assert interpreter.redefine(parse("let a = 2;")[0]) == 3
+    assert interpreter.variables == {"a": 2, "b": 2} # int / int truncates
+
+def test_reactive_session_survives_a_failing_dependent():
+    session = Session(output=io.StringIO(), reactive=True)
+    for line in ("let a = 1;", "let b = 5 / a;", "let a = 0;", "print(a + b);"):
+        session.feed(line)
+    assert session.output.getvalue() == "Error: ZeroDivisionError: division by zero\n6\n"
+
+@pytest.mark.parametrize("lines, expected", [
+    (("let b = 2;", "let c = 10;", "let b = c;", "print(b);"), "10\n"),
+    (("let a = 1;", "let b = a + 1;", "let a = b;", "print(a); print(b);"), "2\n2\n"),
+    (("let c = 1;", "let b = 2;", "let c = 10;", "let b = c;", "print(b);"), "10\n"),
+    (("let a = 1;", "let b = a * 2;", "let a = 3;", "print(b);", "let c = b + a;", "let a = 5;", "print(c);"),
+     "6\n10\n15\n"),
+])
+def test_redefinition_reads_the_latest_bindings(lines, expected):
+    session = Session(output=io.StringIO(), reactive=True)
+    for line in lines:
+        session.feed(line)
+    assert session.output.getvalue() == expected
@@ -0,0 +1,24 @@
+import io
+
+from repl import Session
+
+def feed(session, *lines):
+    for line in lines:
+        session.feed(line)
+    return session.output.getvalue()
+
+def test_runtime_error_is_reported_and_session_continues():
+    session = Session(output=io.StringIO())
+    output = feed(session, "let a = 1 / 0;", "let b = 2;", "print(b);")
+    assert output == "Error: ZeroDivisionError: division by zero\n2\n"
+    assert "a" not in session.variables
+
+def test_undefined_variable_is_reported_and_session_continues():
+    session = Session(output=io.StringIO())
+    assert feed(session, "print(x);", "print(1);") == "Error: Variable 'x' is not defined.\n1\n"
+
+def test_statement_spanning_lines():
+    session = Session(output=io.StringIO())
+    assert session.feed("let a =") is False
+    assert session.feed("  3;") is True
+    assert feed(session, "print(a * 2);") == "6\n"
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+
+from server import EvaluationServer, request, tcp_address
+
+def test_tcp_address_defaults_to_loopback():
+    assert tcp_address("8765") == ("127.0.0.1", 8765)
+    assert tcp_address("localhost:8765") == ("localhost", 8765)
+    assert tcp_address("[::1]:8765") == ("::1", 8765)
+    assert tcp_address("/tmp/apl.sock") is None
+
+@pytest.mark.parametrize("address", ["0.0.0.0:8765", "192.168.1.2:8765", "example.com:8765", ":::8765"])
+def test_tcp_address_rejects_other_hosts(address):
+    with pytest.raises(ValueError):
+        tcp_address(address)
+
+# One statement that runs for minutes: products of numbers with millions of digits
+SLOW = "let a = 3;" + " let a = a * a;" * 16 + " let b = " + " * ".join(["a"] * 200) + "; print(1);"
+
+def serve(tmp_path, scenario, timeout=10.0):
+    async def main():
+        evaluator = EvaluationServer(max_concurrent=1, timeout=timeout)
+        address = str(tmp_path / "server.sock")
+        server = await evaluator.start(address)
+        try:
+            async with server:
+                return await scenario(address)
+        finally:
+            await evaluator.close()
+    return asyncio.run(main())
+
+def test_long_statement_is_stopped_at_the_deadline(tmp_path):
+    async def scenario(address):
+        start = time.monotonic()
+        slow = await request(address, SLOW, timeout=0.5)
+        elapsed = time.monotonic() - start
+        return slow, elapsed, await request(address, "let a = 2; print(a * 3);")
+    slow, elapsed, after = serve(tmp_path, scenario)
+    assert slow == ("", "Error: Time limit exceeded.")
+    assert elapsed < 5
+    assert after == ("6\n", None) # The only slot is free again, on a new worker
+
+@pytest.mark.parametrize("timeout", ["nan", "inf", 0, -1])
+def test_timeout_must_be_positive_and_finite(tmp_path, timeout):
+    async def scenario(address):
+        return await request(address, "print(1);", timeout=timeout)
+    output, error = serve(tmp_path, scenario)
+    assert output == "" and error.startswith("Error: Bad request:")
+
+def test_errors_end_only_their_request(tmp_path):
+    async def scenario(address):
+        return [await request(address, source) for source in ("print(1); print(x);", "print(1 / 0);", "print(2);")]
+    assert serve(tmp_path, scenario) == [("1\n", "Error: Variable 'x' is not defined."),
+                                         ("", "Error: ZeroDivisionError: division by zero"), ("2\n", None)]
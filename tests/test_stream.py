@@ -0,0 +1,50 @@
+import io
+import os
+import subprocess
+import sys
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from stream import statement_chunks, parse_stream
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def lines(source):
+    return io.StringIO(source)
+
+def test_statements_spanning_batches_are_cut_at_semicolons():
+    source = "let a = 0;\n" + "".join(f"let a =\n  a + {i};\n" for i in range(1000))
+    chunks = list(statement_chunks(lines(source), batch=16))
+    assert len(chunks) > 100 # One per batch, not the whole file
+    assert max(len(chunk) for chunk in chunks) < 100
+    assert [token for chunk in chunks for token in zip(chunk.kinds, chunk.values)] == \
+           list(zip(*(lambda buffer: (buffer.kinds, buffer.values))(Lexer(source).tokenize_buffer())))
+
+def test_stream_runs_like_a_whole_program():
+    source = "print(0);\n" + "".join(f"let a{i} =\n  {i} * 2; print(a{i}\n);\n" for i in range(300))
+    expected = io.StringIO()
+    Interpreter(expected).interpret(Parser(Lexer(source).tokenize_buffer()).parse())
+    streamed = io.StringIO()
+    Interpreter(streamed).interpret(parse_stream(lines(source)))
+    assert streamed.getvalue() == expected.getvalue()
+
+def test_first_statements_run_before_the_input_ends():
+    def source(): # One batch that ends inside a statement
+        yield "print(1);\n"
+        yield "let a =\n"
+        for _ in range(254):
+            yield "1 +\n"
+        raise AssertionError("read past the first batch")
+    statements = parse_stream(source())
+    assert repr(next(statements)) == repr(Parser(Lexer("print(1);").tokenize_buffer()).parse()[0])
+
+def test_runtime_exception_is_reported_per_file(tmp_path):
+    failing, program = tmp_path / "fail.txt", tmp_path / "ok.txt"
+    failing.write_text("print(1 / 0);\n")
+    program.write_text("print(1);\n")
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--stream", str(failing), str(program)],
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stdout == "1\n"
+    assert result.stderr == f"{failing}: Error: ZeroDivisionError: division by zero\n"
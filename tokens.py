@@ -1,107 +1,122 @@
-class TokenType:
+from enum import IntEnum
+
+class TokenType(IntEnum):
+    """Token kinds, numbered from 0 so they fit a byte array and index TOKEN_TYPES.
+
+    Members print as their name, so dumps and reprs read "PLUS" rather than a number.
+    """
     # Keywords
-    LET = "LET"
-    PRINT = "PRINT"
-    RETURN = "RETURN"
-    IF = "IF"
-    ELSE = "ELSE"
-    ELIF = "ELIF"
-    FOR = "FOR"
-    WHILE = "WHILE"
-    FUNCTION = "FUNCTION"
-    CLASS = "CLASS"
-    IMPORT = "IMPORT"
-    FROM = "FROM"
-    AS = "AS"
-    TRY = "TRY"
-    EXCEPT = "EXCEPT"
-    FINALLY = "FINALLY"
-    BREAK = "BREAK"
-    CONTINUE = "CONTINUE"
-    PASS = "PASS"
-    DEF = "DEF"
-    GLOBAL = "GLOBAL"
-    NONLOCAL = "NONLOCAL"
-    RAISE = "RAISE"
-    ASSERT = "ASSERT"
-    IN = "IN"
-    IS = "IS"
-    LAMBDA = "LAMBDA"
-    MATCH = "MATCH"
-    CASE = "CASE"
+    LET = 0
+    PRINT = 1
+    RETURN = 2
+    IF = 3
+    ELSE = 4
+    ELIF = 5
+    FOR = 6
+    WHILE = 7
+    FUNCTION = 8
+    CLASS = 9
+    IMPORT = 10
+    FROM = 11
+    AS = 12
+    TRY = 13
+    EXCEPT = 14
+    FINALLY = 15
+    BREAK = 16
+    CONTINUE = 17
+    PASS = 18
+    DEF = 19
+    GLOBAL = 20
+    NONLOCAL = 21
+    RAISE = 22
+    ASSERT = 23
+    IN = 24
+    IS = 25
+    LAMBDA = 26
+    MATCH = 27
+    CASE = 28
 
     # Identifiers & Literals
-    ID = "ID"
-    NUMBER = "NUMBER"
-    STRING = "STRING"
-    CHAR = "CHAR"
+    ID = 29
+    NUMBER = 30
+    STRING = 31
+    CHAR = 32
 
     # Operators
-    PLUS = "PLUS"            # +
-    MINUS = "MINUS"          # -
-    MUL = "MUL"              # *
-    DIV = "DIV"              # /
-    MODULO = "MODULO"        # %
-    POWER = "POWER"          # **
-    FLOOR_DIV = "FLOOR_DIV"  # //
+    PLUS = 33            # +
+    MINUS = 34          # -
+    MUL = 35              # *
+    DIV = 36              # /
+    MODULO = 37        # %
+    POWER = 38          # **
+    FLOOR_DIV = 39  # //
     
     # Comparison Operators
-    EQUALS = "EQUALS"        # ==
-    NOT_EQUALS = "NOT_EQUALS"  # !=
-    LESS_THAN = "LESS_THAN"  # <
-    LESS_EQUAL = "LESS_EQUAL"  # <=
-    GREATER_THAN = "GREATER_THAN"  # >
-    GREATER_EQUAL = "GREATER_EQUAL"  # >=
+    EQUALS = 40        # ==
+    NOT_EQUALS = 41  # !=
+    LESS_THAN = 42  # <
+    LESS_EQUAL = 43  # <=
+    GREATER_THAN = 44  # >
+    GREATER_EQUAL = 45  # >=
 
     # Assignment Operators
-    ASSIGN = "ASSIGN"  # =
-    PLUS_ASSIGN = "PLUS_ASSIGN"  # +=
-    MINUS_ASSIGN = "MINUS_ASSIGN"  # -=
-    MUL_ASSIGN = "MUL_ASSIGN"  # *=
-    DIV_ASSIGN = "DIV_ASSIGN"  # /=
-    MOD_ASSIGN = "MOD_ASSIGN"  # %=
-    POWER_ASSIGN = "POWER_ASSIGN"  # **=
-    FLOOR_DIV_ASSIGN = "FLOOR_DIV_ASSIGN"  # //=
+    ASSIGN = 46  # =
+    PLUS_ASSIGN = 47  # +=
+    MINUS_ASSIGN = 48  # -=
+    MUL_ASSIGN = 49  # *=
+    DIV_ASSIGN = 50  # /=
+    MOD_ASSIGN = 51  # %=
+    POWER_ASSIGN = 52  # **=
+    FLOOR_DIV_ASSIGN = 53  # //=
 
     # Logical Operators
-    AND = "AND"  # and
-    OR = "OR"  # or
-    NOT = "NOT"  # not
+    AND = 54  # and
+    OR = 55  # or
+    NOT = 56  # not
 
     # Bitwise Operators
-    BIT_AND = "BIT_AND"  # &
-    BIT_OR = "BIT_OR"  # |
-    BIT_XOR = "BIT_XOR"  # ^
-    BIT_NOT = "BIT_NOT"  # ~
-    BIT_LSHIFT = "BIT_LSHIFT"  # <<
-    BIT_RSHIFT = "BIT_RSHIFT"  # >>
+    BIT_AND = 57  # &
+    BIT_OR = 58  # |
+    BIT_XOR = 59  # ^
+    BIT_NOT = 60  # ~
+    BIT_LSHIFT = 61  # <<
+    BIT_RSHIFT = 62  # >>
 
     # Delimiters & Separators
-    LPAREN = "LPAREN"  # (
-    RPAREN = "RPAREN"  # )
-    LBRACE = "LBRACE"  # {
-    RBRACE = "RBRACE"  # }
-    LBRACKET = "LBRACKET"  # [
-    RBRACKET = "RBRACKET"  # ]
-    COMMA = "COMMA"  # ,
-    DOT = "DOT"  # .
-    COLON = "COLON"  # :
-    SEMICOLON = "SEMICOLON"  # ;
-    ARROW = "ARROW"  # ->
-    DOUBLE_ARROW = "DOUBLE_ARROW"  # =>
-    QUESTION_MARK = "QUESTION_MARK"  # ?
-    EXCLAMATION_MARK = "EXCLAMATION_MARK"  # !
+    LPAREN = 63  # (
+    RPAREN = 64  # )
+    LBRACE = 65  # {
+    RBRACE = 66  # }
+    LBRACKET = 67  # [
+    RBRACKET = 68  # ]
+    COMMA = 69  # ,
+    DOT = 70  # .
+    COLON = 71  # :
+    SEMICOLON = 72  # ;
+    ARROW = 73  # ->
+    DOUBLE_ARROW = 74  # =>
+    QUESTION_MARK = 75  # ?
+    EXCLAMATION_MARK = 76  # !
 
     # String & Character Handling
-    DOUBLE_QUOTE = "DOUBLE_QUOTE"  # "
-    SINGLE_QUOTE = "SINGLE_QUOTE"  # '
-    ESCAPE_SEQUENCE = "ESCAPE_SEQUENCE"  # \n, \t, \r, etc.
+    DOUBLE_QUOTE = 77  # "
+    SINGLE_QUOTE = 78  # '
+    ESCAPE_SEQUENCE = 79  # \n, \t, \r, etc.
 
     # Special & Miscellaneous Tokens
-    NEWLINE = "NEWLINE"  # \n
-    TAB = "TAB"  # \t
-    SPACE = "SPACE"  #  
-    COMMENT = "COMMENT"  # #
-    MULTI_COMMENT = "MULTI_COMMENT"  # """ or '''
-    ERROR = "ERROR"  # Invalid token
-    EOF = "EOF"  # End of file
+    NEWLINE = 80  # \n
+    TAB = 81  # \t
+    SPACE = 82  #  
+    COMMENT = 83  # #
+    MULTI_COMMENT = 84  # """ or '''
+    ERROR = 85  # Invalid token
+    EOF = 86  # End of file
+
+    def __str__(self):
+        return self.name
+
+    def __format__(self, format_spec):
+        return format(self.name, format_spec)
+
+# Token kind number -> TokenType member, for turning raw kind codes back into members
+TOKEN_TYPES = tuple(TokenType)
@@ -0,0 +1,230 @@
+import sys
+from array import array
+
+from tokens import TokenType, TOKEN_TYPES
+from ast_nodes import *
+from arrays import make_array, is_array, array_division, reduce_value, shape_error
+
+# Opcodes. Every instruction is an (opcode, argument) pair stored flat in one array;
+# instructions without an operand carry a 0 argument.
+LOAD_CONST = 0      # push consts[arg]
+LOAD_VAR = 1        # push the variable named names[arg]
+STORE_VAR = 2       # pop into the variable named names[arg]
+PRINT = 3           # pop and print
+BINARY_ADD = 4
+BINARY_SUB = 5
+BINARY_MUL = 6
+BINARY_DIV = 7
+BINARY_UNKNOWN = 8  # pop two operands, then report consts[arg] as an unknown operator
+FAIL = 9            # report consts[arg] as an error message and stop
+BUILD_ARRAY = 10    # pop arg values into one array
+REDUCE = 11         # pop and reduce with the TokenType operator numbered arg
+
+BINARY_OPCODES = {
+    TokenType.PLUS: BINARY_ADD,
+    TokenType.MINUS: BINARY_SUB,
+    TokenType.MUL: BINARY_MUL,
+    TokenType.DIV: BINARY_DIV,
+}
+
+OPCODE_NAMES = {
+    LOAD_CONST: "LOAD_CONST", LOAD_VAR: "LOAD_VAR", STORE_VAR: "STORE_VAR", PRINT: "PRINT",
+    BINARY_ADD: "BINARY_ADD", BINARY_SUB: "BINARY_SUB", BINARY_MUL: "BINARY_MUL",
+    BINARY_DIV: "BINARY_DIV", BINARY_UNKNOWN: "BINARY_UNKNOWN", FAIL: "FAIL",
+    BUILD_ARRAY: "BUILD_ARRAY", REDUCE: "REDUCE",
+}
+
+class CodeObject:
+    """A compiled program: the flat instruction array plus its constant and name tables."""
+    def __init__(self, code, consts, names):
+        self.code = code
+        self.consts = consts
+        self.names = names
+
+    def disassemble(self):
+        """Returns one readable line per instruction, for debugging."""
+        lines = []
+        for index in range(0, len(self.code), 2):
+            opcode, arg = self.code[index], self.code[index + 1]
+            if opcode == LOAD_VAR or opcode == STORE_VAR:
+                detail = self.names[arg]
+            elif opcode in (LOAD_CONST, BINARY_UNKNOWN, FAIL):
+                detail = repr(self.consts[arg])
+            elif opcode == BUILD_ARRAY:
+                detail = str(arg)
+            elif opcode == REDUCE:
+                detail = TOKEN_TYPES[arg].name
+            else:
+                detail = ""
+            lines.append(f"{index // 2:6}  {OPCODE_NAMES[opcode]:<15}{detail}")
+        return lines
+
+class Compiler:
+    """Compiles a list of AST statements into a CodeObject for the VM."""
+    def __init__(self):
+        self.code = []
+        self.consts = []
+        self.names = []
+        self.const_index = {}
+        self.name_index = {}
+
+    def compile(self, nodes):
+        # Top-level lists are flattened exactly like Interpreter.interpret does
+        for node in nodes:
+            if isinstance(node, list):
+                for sub_node in node:
+                    self.compile_statement(sub_node)
+            else:
+                self.compile_statement(node)
+        return CodeObject(array('l', self.code), self.consts, self.names)
+
+    def emit(self, opcode, arg=0):
+        self.code += (opcode, arg)
+
+    def add_const(self, value):
+        try:
+            key = (value.__class__, value)
+            if key not in self.const_index:
+                self.const_index[key] = len(self.consts)
+                self.consts.append(value)
+            return self.const_index[key]
+        except TypeError:  # Unhashable constants are simply not shared
+            self.consts.append(value)
+            return len(self.consts) - 1
+
+    def add_name(self, name):
+        if name not in self.name_index:
+            self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return self.name_index[name]
+
+    def compile_statement(self, node):
+        # Statements the Interpreter does not execute are skipped, as Interpreter.execute does
+        if isinstance(node, AssignNode):
+            self.compile_expression(node.expr)
+            self.emit(STORE_VAR, self.add_name(node.var))
+
+        elif isinstance(node, PrintNode):
+            self.compile_expression(node.expr)
+            self.emit(PRINT)
+
+    def compile_expression(self, node):
+        # Post-order walk with an explicit stack, so deep trees compile without recursion.
+        # An operation's own instruction is pushed as an (opcode, arg) tuple below its
+        # operands and emitted once they have all been compiled.
+        code = self.code
+        add_const = self.add_const
+        pending = [node]
+        push = pending.append
+        pop = pending.pop
+        while pending:
+            node = pop()
+
+            if isinstance(node, NumberNode):
+                code += (LOAD_CONST, add_const(node.value))
+
+            elif isinstance(node, VarNode):
+                code += (LOAD_VAR, self.add_name(node.name))
+
+            elif isinstance(node, BinOpNode):
+                if node.op in BINARY_OPCODES:
+                    push((BINARY_OPCODES[node.op], 0))
+                else:
+                    push((BINARY_UNKNOWN, add_const(node.op)))
+                push(node.right)
+                push(node.left)
+
+            elif isinstance(node, tuple):
+                code += node
+
+            elif isinstance(node, ArrayNode):
+                push((BUILD_ARRAY, len(node.elements)))
+                pending.extend(reversed(node.elements))
+
+            elif isinstance(node, ReduceNode):
+                push((REDUCE, int(node.op)))
+                push(node.operand)
+
+            else:
+                code += (FAIL, add_const(f"Unknown node type '{type(node)}'."))
+
+class VM:
+    """Stack machine that runs CodeObjects with the same semantics as Interpreter."""
+    def __init__(self, output=None):
+        self.variables = {} # Store variables and their assigned values
+        self.output = output # Stream for program output and error messages, stdout when None
+
+    def interpret(self, nodes):
+        self.run(Compiler().compile(nodes))
+
+    def run(self, code_object):
+        consts = code_object.consts
+        names = code_object.names
+        variables = self.variables
+        output = self.output
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        # Code is straight-line (the language has no jumps yet), so instructions are
+        # read pairwise from one iterator instead of maintaining a program counter.
+        instructions = iter(code_object.code)
+        for opcode, arg in zip(instructions, instructions):
+            if opcode == LOAD_VAR:
+                name = names[arg]
+                if name in variables:
+                    push(variables[name])
+                else:
+                    print(f"Error: Variable '{name}' is not defined.", file=output)
+                    sys.exit(1)
+
+            elif opcode == LOAD_CONST:
+                push(consts[arg])
+
+            elif opcode == STORE_VAR:
+                variables[names[arg]] = pop()
+
+            elif opcode == PRINT:
+                print(pop(), file=output)
+
+            elif opcode <= BINARY_UNKNOWN:
+                right = pop()
+                left = pop()
+
+                # Convert string numbers to float if required
+                left = float(left) if isinstance(left, str) else left
+                right = float(right) if isinstance(right, str) else right
+
+                try:
+                    if opcode == BINARY_ADD:
+                        result = left + right
+                    elif opcode == BINARY_SUB:
+                        result = left - right
+                    elif opcode == BINARY_MUL:
+                        result = left * right
+                    elif opcode == BINARY_DIV:
+                        if is_array(left) or is_array(right):
+                            result = array_division(left, right)
+                        else:
+                            result = left / right
+                    else:
+                        print(f"Error: Unknown operator '{consts[arg]}'.", file=output)
+                        sys.exit(1)
+                except ValueError: # Only arrays raise it, when their shapes do not broadcast
+                    shape_error(left, right, output)
+
+                if isinstance(left, int) and isinstance(right, int): # Integer operands give an integer result
+                    result = int(result)
+                push(result)
+
+            elif opcode == BUILD_ARRAY:
+                elements = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                push(make_array(elements, output))
+
+            elif opcode == REDUCE:
+                push(reduce_value(TOKEN_TYPES[arg], pop(), output))
+
+            else:
+                print(f"Error: {consts[arg]}", file=output)
+                sys.exit(1)